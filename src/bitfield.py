@@ -0,0 +1,195 @@
+"""
+Helpers for BitTorrent piece bitfields.
+
+A bitfield is a byte string where bit i (counting from the high bit of the
+first byte) is set when piece i is available. Bitfields are stored as
+bytearrays so that membership is a single index-and-mask and a whole peer
+bitfield costs one bit per piece.
+"""
+
+from itertools import compress, repeat
+from operator import add, mul
+
+# Translates the ASCII digits of a binary string into 0/1 bytes usable as itertools.compress selectors
+_BINARY_DIGITS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def bitfield_size(piece_count: int) -> int:
+    """Get the number of bytes needed to hold a bitfield for piece_count pieces."""
+    return (piece_count + 7) >> 3
+
+
+def has_bit(bitfield: bytes | bytearray, index: int) -> bool:
+    """
+    Check whether a bit is set.
+
+    Args:
+        bitfield: Bitfield data
+        index: Bit index
+
+    Returns:
+        True if the bit is set, False if it is clear or out of range
+    """
+    byte_index = index >> 3
+    if index < 0 or byte_index >= len(bitfield):
+        return False
+    return bool(bitfield[byte_index] & (0x80 >> (index & 7)))
+
+
+def set_bit(bitfield: bytearray, index: int) -> None:
+    """
+    Set a bit, growing the bitfield if the index is past its end.
+
+    Args:
+        bitfield: Bitfield to modify in place
+        index: Bit index
+    """
+    byte_index = index >> 3
+    if byte_index >= len(bitfield):
+        bitfield.extend(bytes(byte_index + 1 - len(bitfield)))
+    bitfield[byte_index] |= 0x80 >> (index & 7)
+
+
+def clear_bit(bitfield: bytearray, index: int) -> None:
+    """
+    Clear a bit; indices past the end are already clear.
+
+    Args:
+        bitfield: Bitfield to modify in place
+        index: Bit index
+    """
+    byte_index = index >> 3
+    if 0 <= byte_index < len(bitfield):
+        bitfield[byte_index] &= ~(0x80 >> (index & 7)) & 0xFF
+
+
+def intersects(bitfield: bytes | bytearray, other: bytes | bytearray) -> bool:
+    """
+    Check whether two bitfields have any set bit in common.
+
+    Args:
+        bitfield: First bitfield
+        other: Second bitfield (bits past the shorter one are ignored)
+
+    Returns:
+        True if at least one bit is set in both
+    """
+    size = min(len(bitfield), len(other))
+    return int.from_bytes(bitfield[:size], "big") & int.from_bytes(other[:size], "big") != 0
+
+
+def merge_into(target: bytearray, other: bytes | bytearray, max_size: int | None = None) -> None:
+    """
+    OR another bitfield into target, growing target if other is longer.
+
+    Args:
+        target: Bitfield to modify in place
+        other: Bitfield to merge
+        max_size: Ignore bytes of other past this length (e.g. when other comes from a peer)
+    """
+    if max_size is not None and len(other) > max_size:
+        other = other[:max_size]
+    size = len(other)
+    if size > len(target):
+        target.extend(bytes(size - len(target)))
+    if not any(target):
+        # Common case: a peer's first BITFIELD, nothing to OR with
+        target[:size] = other
+        return
+    merged = int.from_bytes(target[:size], "big") | int.from_bytes(other, "big")
+    target[:size] = merged.to_bytes(size, "big")
+
+
+def intersection(bitfield: bytes | bytearray, other: bytes | bytearray) -> bytes:
+    """
+    Get the bits set in both bitfields.
+
+    Args:
+        bitfield: First bitfield
+        other: Second bitfield (shorter bitfields are zero-padded)
+
+    Returns:
+        Bitfield of the same length as bitfield
+    """
+    size = len(bitfield)
+    other_bits = int.from_bytes(bytes(other[:size]).ljust(size, b"\x00"), "big")
+    return (int.from_bytes(bitfield, "big") & other_bits).to_bytes(size, "big")
+
+
+def difference(bitfield: bytes | bytearray, other: bytes | bytearray) -> bytes:
+    """
+    Get the bits set in bitfield but not in other.
+
+    Args:
+        bitfield: Bitfield to subtract from
+        other: Bitfield to subtract (shorter bitfields are zero-padded)
+
+    Returns:
+        Bitfield of the same length as bitfield
+    """
+    size = len(bitfield)
+    other_bits = int.from_bytes(bytes(other[:size]).ljust(size, b"\x00"), "big")
+    return (int.from_bytes(bitfield, "big") & ~other_bits).to_bytes(size, "big")
+
+
+def count_bits(bitfield: bytes | bytearray) -> int:
+    """Count the set bits in a bitfield (a single native popcount over the whole bitfield)."""
+    return int.from_bytes(bitfield, "big").bit_count()
+
+
+def set_bit_indices(bitfield: bytes | bytearray, limit: int | None = None) -> list[int]:
+    """
+    Get the indices of all set bits in a bitfield.
+
+    The bit scan runs in C: the bitfield is rendered as a fixed-width binary
+    string and the set positions are selected with itertools.compress.
+
+    Args:
+        bitfield: Bitfield data
+        limit: Only report indices below this value (e.g. the piece count, to skip spare trailing bits)
+
+    Returns:
+        Sorted list of set bit indices
+    """
+    selectors = _bit_selectors(bitfield, limit)
+    return list(compress(range(len(selectors)), selectors))
+
+
+def accumulate_bits(counts: list[int], bitfield: bytes | bytearray, delta: int = 1) -> None:
+    """
+    Add delta to counts[i] for every bit i set in bitfield, never going below zero.
+
+    Sparse bitfields (e.g. after a single HAVE) update only the set positions;
+    dense ones (e.g. a seed's BITFIELD) update the whole list with a single C-level
+    map over per-bit 0/1 selectors instead of a Python loop per piece.
+
+    Args:
+        counts: Per-bit counters to update in place (bits past its end are ignored)
+        bitfield: Bitfield data
+        delta: Amount to add for each set bit
+    """
+    size = len(counts)
+    bitfield = bitfield[: bitfield_size(size)]
+    if count_bits(bitfield) * 4 < size:
+        for index in set_bit_indices(bitfield, size):
+            counts[index] = max(0, counts[index] + delta)
+        return
+
+    selectors = _bit_selectors(bitfield, size)
+    updated = map(add, counts, selectors) if delta == 1 else map(add, counts, map(mul, selectors, repeat(delta)))
+    if delta < 0:
+        updated = map(max, updated, repeat(0))
+    counts[: len(selectors)] = updated
+
+
+def _bit_selectors(bitfield: bytes | bytearray, limit: int | None = None) -> bytes:
+    """Expand a bitfield into one 0/1 byte per bit, optionally truncated to limit bits."""
+    if limit is not None:
+        bitfield = bitfield[: bitfield_size(limit)]
+    if not bitfield:
+        return b""
+    digits = format(int.from_bytes(bitfield, "big"), f"0{len(bitfield) * 8}b").encode("ascii")
+    selectors = digits.translate(_BINARY_DIGITS)
+    if limit is not None:
+        selectors = selectors[:limit]
+    return selectors
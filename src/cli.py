@@ -10,6 +10,7 @@ from pathlib import Path
 from client import TorrentClient
 from magnet import is_magnet_link
 from magnet_client import create_parser_from_magnet
+from tracker import Tracker
 
 
 async def main() -> None:
@@ -79,6 +80,8 @@ async def main() -> None:
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        await Tracker.close()
 
 
 if __name__ == "__main__":
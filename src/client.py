@@ -4,10 +4,12 @@ Main BitTorrent client implementation.
 
 import asyncio
 import logging
+import struct
 import time
 from collections import deque
 from pathlib import Path
 
+from bitfield import accumulate_bits, difference, merge_into
 from file_manager import FileManager
 from peer import MessageType, Peer
 from piece_manager import Block, PieceManager, PieceStatus
@@ -17,6 +19,9 @@ from tui import TorrentTUI
 
 logger = logging.getLogger(__name__)
 
+# PIECE payload header: <index><begin>
+_PIECE_HEADER = struct.Struct(">II")
+
 
 class TorrentClient:
     """Main BitTorrent client."""
@@ -81,6 +86,8 @@ class TorrentClient:
         # Speed tracking
         self.piece_completion_times: deque[float] = deque(maxlen=100)  # Track last 100 piece completions
         self.block_completion_times: deque[float] = deque(maxlen=500)  # Track last 500 block completions
+        self._pps_cache: tuple[float, float] = (0.0, 0.0)  # (monotonic timestamp, pieces per second)
+        self._pps_cache_ttl = 1.0  # Status polls within this window reuse the last value
         self.start_time: float | None = None
         self.tui: TorrentTUI | None = None
 
@@ -156,45 +163,37 @@ class TorrentClient:
         if not isinstance(pieces_data, bytes):
             return []
 
-        pieces = []
         total_pieces = len(pieces_data) // 20  # Each hash is 20 bytes
+        if total_pieces == 0:
+            return []
 
-        for i in range(total_pieces):
-            piece_hash = pieces_data[i * 20 : (i + 1) * 20]
-
-            # Calculate actual piece length (last piece may be shorter)
-            if i == total_pieces - 1:
-                actual_length = total_size - (i * piece_length)
-            else:
-                actual_length = piece_length
+        hashes = info.piece_hashes
 
-            pieces.append((i, actual_length, piece_hash))
+        # Every piece is piece_length long except the last, which may be shorter
+        lengths = [piece_length] * total_pieces
+        lengths[-1] = total_size - (total_pieces - 1) * piece_length
 
-        return pieces
+        return list(zip(range(total_pieces), lengths, hashes, strict=True))
 
-    def _update_piece_availability(self, peer: Peer, pieces: set[int]) -> None:
+    def _update_piece_availability(self, peer: Peer) -> None:
         """Track availability counts for rarest-first selection."""
         if not self.piece_availability:
             return
 
-        new_pieces = pieces - peer.counted_pieces
-        if not new_pieces:
+        new_pieces = difference(peer.bitfield, peer.counted_pieces)
+        if not any(new_pieces):
             return
 
-        for piece_index in new_pieces:
-            if 0 <= piece_index < len(self.piece_availability):
-                self.piece_availability[piece_index] += 1
-        peer.counted_pieces.update(new_pieces)
+        accumulate_bits(self.piece_availability, new_pieces)
+        merge_into(peer.counted_pieces, new_pieces)
 
     def _decrement_peer_availability(self, peer: Peer) -> None:
         """Remove a peer's contribution from availability counts."""
-        if not self.piece_availability or not peer.counted_pieces:
+        if not self.piece_availability or not any(peer.counted_pieces):
             return
 
-        for piece_index in peer.counted_pieces:
-            if 0 <= piece_index < len(self.piece_availability):
-                self.piece_availability[piece_index] = max(0, self.piece_availability[piece_index] - 1)
-        peer.counted_pieces.clear()
+        accumulate_bits(self.piece_availability, peer.counted_pieces, -1)
+        peer.counted_pieces[:] = bytes(len(peer.counted_pieces))
 
     async def _download_loop(self) -> None:
         """Main download loop."""
@@ -283,7 +282,11 @@ class TorrentClient:
                     peer_key = f"{peer_info['ip']}:{peer_info['port']}"
                     if peer_key not in self.peers:
                         peer = Peer(
-                            ip=peer_info["ip"], port=peer_info["port"], info_hash=self.info_hash, peer_id=self.peer_id
+                            ip=peer_info["ip"],
+                            port=peer_info["port"],
+                            info_hash=self.info_hash,
+                            peer_id=self.peer_id,
+                            piece_count=self.parser.get_piece_count(),
                         )
                         self.peers[peer_key] = peer
                         total_added += 1
@@ -383,10 +386,13 @@ class TorrentClient:
 
                 if msg_type == MessageType.BITFIELD:
                     await peer.handle_bitfield(payload)
-                    self._update_piece_availability(peer, peer.bitfield or set())
+                    self._update_piece_availability(peer)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        # Counting pieces popcounts the whole bitfield, so only do it when it is logged
+                        logger.debug("Peer %s has %d pieces", peer_key, peer.piece_count())
                 elif msg_type == MessageType.HAVE:
                     await peer.handle_have(payload)
-                    self._update_piece_availability(peer, peer.pieces_have)
+                    self._update_piece_availability(peer)
                 elif msg_type == MessageType.UNCHOKE:
                     await peer.handle_unchoke()
                 elif msg_type == MessageType.CHOKE:
@@ -432,8 +438,7 @@ class TorrentClient:
                 if msg_type == MessageType.PIECE:
                     # Parse piece message: <index><begin><block>
                     if len(payload) >= 8:
-                        piece_index = int.from_bytes(payload[0:4], "big")
-                        begin = int.from_bytes(payload[4:8], "big")
+                        piece_index, begin = _PIECE_HEADER.unpack_from(payload)
                         block_data = payload[8:]
 
                         # Route to waiting piece downloader
@@ -460,11 +465,11 @@ class TorrentClient:
 
                 elif msg_type == MessageType.HAVE:
                     await peer.handle_have(payload)
-                    self._update_piece_availability(peer, peer.pieces_have)
+                    self._update_piece_availability(peer)
 
                 elif msg_type == MessageType.BITFIELD:
                     await peer.handle_bitfield(payload)
-                    self._update_piece_availability(peer, peer.bitfield or set())
+                    self._update_piece_availability(peer)
 
             except TimeoutError:
                 continue
@@ -489,17 +494,17 @@ class TorrentClient:
                 continue
 
             # Refresh pieces peer has
-            if peer.bitfield:
-                peer_pieces = peer.bitfield
-            else:
-                peer_pieces = peer.pieces_have
+            peer_pieces = peer.bitfield
 
-            if not peer_pieces:
+            if not any(peer_pieces):
                 await asyncio.sleep(0.5)
                 continue
 
-            # Start new piece downloads up to max concurrent
-            while len(download_tasks) < self.max_concurrent_pieces_per_peer:
+            # Start new piece downloads up to max concurrent, skipping the
+            # piece scan entirely if the peer has nothing we still need
+            while len(download_tasks) < self.max_concurrent_pieces_per_peer and peer.has_any_wanted(
+                self.piece_manager.wanted_pieces
+            ):
                 piece = self.piece_manager.get_next_piece_to_download(peer_pieces, availability=self.piece_availability)
                 if not piece:
                     break
@@ -586,8 +591,8 @@ class TorrentClient:
 
                 if key in pending_blocks:
                     pending_blocks.pop(key)
-                await self.piece_manager.add_block_data(queued_piece_index, block_offset, block_data)
-                await self.piece_manager.mark_block_received(queued_piece_index, block_offset)
+                self.piece_manager.add_block_data(queued_piece_index, block_offset, block_data)
+                self.piece_manager.mark_block_received(queued_piece_index, block_offset)
                 self.block_completion_times.append(time.time())
 
             for item in leftovers:
@@ -597,20 +602,20 @@ class TorrentClient:
             # Pipeline: request multiple blocks in parallel
             while True:
                 # Check if piece is complete
-                if await self.piece_manager.is_piece_complete(piece.index):
+                if self.piece_manager.is_piece_complete(piece.index):
                     break
 
                 await drain_message_queue_for_piece()
 
                 # Request blocks up to pipeline limit
-                sent_requests = 0
+                requests: list[tuple[int, int, int]] = []
                 while len(pending_blocks) < self.max_pipeline_blocks:
-                    block = await self.piece_manager.get_next_block_to_request(piece.index)
+                    block = self.piece_manager.get_next_block_to_request(piece.index)
                     if not block:
                         break
 
                     # Check if piece is complete
-                    if await self.piece_manager.is_piece_complete(piece.index):
+                    if self.piece_manager.is_piece_complete(piece.index):
                         break
 
                     key = (piece.index, block.offset)
@@ -620,13 +625,13 @@ class TorrentClient:
                     key = (piece.index, block.offset)
                     pending_blocks[key] = block
 
-                    # Mark and request block
-                    await self.piece_manager.mark_block_requested(piece.index, block.offset)
-                    await peer.send_request(piece.index, block.offset, block.length, drain=False)
-                    sent_requests += 1
+                    # Mark block and queue its request
+                    self.piece_manager.mark_block_requested(piece.index, block.offset)
+                    requests.append((piece.index, block.offset, block.length))
 
-                if sent_requests:
-                    await peer.flush()
+                # Send all queued requests in one write
+                if requests:
+                    await peer.send_requests_batch(requests)
 
                 if not pending_blocks:
                     break
@@ -650,7 +655,7 @@ class TorrentClient:
                             if not future.done():
                                 future.cancel()
                             block_futures.pop(future, None)
-                        await self.piece_manager.mark_block_received(key[0], key[1])
+                        self.piece_manager.mark_block_received(key[0], key[1])
                         pending_blocks.pop(key)
                     if timeout_count >= 3:
                         break
@@ -667,8 +672,8 @@ class TorrentClient:
                             piece_index, block_offset = key
 
                             # Add block data
-                            await self.piece_manager.add_block_data(piece_index, block_offset, block_data)
-                            await self.piece_manager.mark_block_received(piece_index, block_offset)
+                            self.piece_manager.add_block_data(piece_index, block_offset, block_data)
+                            self.piece_manager.mark_block_received(piece_index, block_offset)
                             self.block_completion_times.append(time.time())
 
                             # Remove from pending
@@ -697,7 +702,7 @@ class TorrentClient:
                             future = piece_waiters.pop(key)
                             if not future.done():
                                 future.cancel()
-                            await self.piece_manager.mark_block_received(key[0], key[1])
+                            self.piece_manager.mark_block_received(key[0], key[1])
                     return (False, piece.index)
 
             # Check for any remaining blocks in queue
@@ -705,25 +710,25 @@ class TorrentClient:
                 try:
                     piece_index, block_offset, block_data = message_queue.get_nowait()
                     if piece_index == piece.index:
-                        await self.piece_manager.add_block_data(piece_index, block_offset, block_data)
-                        await self.piece_manager.mark_block_received(piece_index, block_offset)
+                        self.piece_manager.add_block_data(piece_index, block_offset, block_data)
+                        self.piece_manager.mark_block_received(piece_index, block_offset)
                         # Track block completion time
                         self.block_completion_times.append(time.time())
                 except asyncio.QueueEmpty:
                     break
 
             # Assemble piece
-            piece_data = await self.piece_manager.assemble_piece(piece.index)
+            piece_data = self.piece_manager.assemble_piece(piece.index)
             if not piece_data:
                 return (False, piece.index)
 
             # Verify piece
-            if not self.piece_manager.verify_piece(piece.index, piece_data):
+            if not await self.piece_manager.verify_piece_async(piece.index, piece_data):
                 logger.warning(f"Piece {piece.index} verification failed")
                 return (False, piece.index)
 
             # Write to file
-            self.file_manager.write_piece(piece.index, piece_data)
+            await self.file_manager.write_piece_async(piece.index, piece_data)
 
             logger.info(f"Downloaded and verified piece {piece.index}")
             return (True, piece.index)
@@ -769,6 +774,22 @@ class TorrentClient:
         self.downloading = False
 
     def _calculate_pieces_per_second(self) -> float:
+        """
+        Get pieces downloaded per second, cached for a short TTL.
+
+        Returns:
+            Pieces per second (0.0 if no data)
+        """
+        now = time.monotonic()
+        cached_at, cached_value = self._pps_cache
+        if now - cached_at < self._pps_cache_ttl:
+            return cached_value
+
+        value = self._compute_pieces_per_second()
+        self._pps_cache = (now, value)
+        return value
+
+    def _compute_pieces_per_second(self) -> float:
         """
         Calculate pieces downloaded per second based on recent completions.
 
@@ -2,12 +2,18 @@
 File manager for writing downloaded pieces to disk.
 """
 
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from torrent_parser import TorrentFile
 
+# Positional writes avoid a seek per segment and leave no shared file position to race on
+_HAS_PWRITE = hasattr(os, "pwrite")
+
 
 class FileManager:
     """Manages writing downloaded pieces to files."""
@@ -27,6 +33,8 @@ class FileManager:
         self.file_handles: dict[str, any] = {}
         self.file_offsets: dict[int, list[tuple[str, int, int, int]]] = {}
         # piece_index -> [(file_path, offset_in_file, length, offset_in_piece)]
+        # Single writer thread: keeps disk I/O off the event loop and file handle creation race-free
+        self._write_executor: ThreadPoolExecutor | None = None
 
         # Create output directory
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -80,7 +88,7 @@ class FileManager:
                 self.file_handles[file_path] = open(file_path, "w+b")
         return self.file_handles[file_path]
 
-    def write_piece(self, piece_index: int, piece_data: bytes) -> None:
+    def write_piece(self, piece_index: int, piece_data: bytes | bytearray) -> None:
         """
         Write a piece to the appropriate file(s).
 
@@ -92,16 +100,41 @@ class FileManager:
             return
 
         segments = self.file_offsets[piece_index]
+        view = memoryview(piece_data)
         for file_path, offset_in_file, length, offset_in_piece in segments:
             # Get file handle
             f = self._get_file_handle(file_path)
-            # Seek to the correct position
-            f.seek(offset_in_file)
             # Write the piece slice that maps to this file segment
-            f.write(piece_data[offset_in_piece : offset_in_piece + length])
+            segment = view[offset_in_piece : offset_in_piece + length]
+            if _HAS_PWRITE:
+                fd = f.fileno()
+                while segment:
+                    written = os.pwrite(fd, segment, offset_in_file)
+                    segment = segment[written:]
+                    offset_in_file += written
+            else:
+                f.seek(offset_in_file)
+                f.write(segment)
+
+    async def write_piece_async(self, piece_index: int, piece_data: bytes | bytearray) -> None:
+        """
+        Write a piece to disk on the writer thread.
+
+        Args:
+            piece_index: Index of the piece
+            piece_data: Piece data to write (must not be modified until the write completes)
+        """
+        if self._write_executor is None:
+            self._write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="piece-writer")
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._write_executor, self.write_piece, piece_index, piece_data)
 
     def close_all(self) -> None:
         """Close all open file handles."""
+        if self._write_executor is not None:
+            # Let queued writes finish before their files are closed
+            self._write_executor.shutdown(wait=True)
+            self._write_executor = None
         for f in self.file_handles.values():
             f.close()
         self.file_handles.clear()
@@ -12,6 +12,19 @@ from typing import Any
 
 from pydantic import BaseModel, Field, computed_field
 
+# Bencode token bytes
+_INT = ord("i")
+_LIST = ord("l")
+_DICT = ord("d")
+_END = ord("e")
+_DIGIT_0 = ord("0")
+_DIGIT_9 = ord("9")
+_COLON = ord(":")
+# Longest decimal string length worth looking for a colon after (enough for any 64-bit length)
+_MAX_LENGTH_DIGITS = 20
+# Marks a dictionary that is waiting for its next key rather than a value
+_NO_KEY = object()
+
 
 class MagnetError(Exception):
     """Exception raised for magnet link errors."""
@@ -187,68 +200,119 @@ def bencode_encode(value: Any) -> bytes:
         raise ValueError(f"Cannot encode type: {type(value)}")
 
 
-def bencode_decode(data: bytes, index: int = 0) -> tuple[Any, int]:
+def bencode_decode(data: bytes, index: int = 0, key_strings: dict[bytes, str] | None = None) -> tuple[Any, int]:
     """
     Decode bencoded data.
 
+    Works iteratively with an explicit stack of open lists and dictionaries
+    and compares byte values rather than one-byte slices, so deeply nested
+    or very large input costs neither recursion nor a slice per token.
+
     Args:
         data: The raw bytes to decode
         index: Current position in the data
+        key_strings: Cache of already decoded dictionary keys, updated in place
+            (repeated keys then share a single str)
 
     Returns:
         Tuple of (decoded_value, new_index)
-    """
-    if index >= len(data):
-        raise ValueError(f"Unexpected end of data at index {index}")
-
-    char = data[index : index + 1]
-
-    # Integer: i<number>e
-    if char == b"i":
-        end_index = data.find(b"e", index + 1)
-        if end_index == -1:
-            raise ValueError(f"Unterminated integer at index {index}")
-        value = int(data[index + 1 : end_index])
-        return value, end_index + 1
-
-    # List: l<elements>e
-    elif char == b"l":
-        index += 1
-        result: list[Any] = []
-        while index < len(data) and data[index : index + 1] != b"e":
-            value, index = bencode_decode(data, index)
-            result.append(value)
-        if index >= len(data):
-            raise ValueError(f"Unterminated list at index {index}")
-        return result, index + 1
-
-    # Dictionary: d<key-value pairs>e
-    elif char == b"d":
-        index += 1
-        result_dict: dict[Any, Any] = {}
-        while index < len(data) and data[index : index + 1] != b"e":
-            key, index = bencode_decode(data, index)
-            value, index = bencode_decode(data, index)
-            # Keep keys as bytes for binary safety
-            if isinstance(key, bytes):
-                key = key.decode("utf-8", errors="replace")
-            result_dict[key] = value
-        if index >= len(data):
-            raise ValueError(f"Unterminated dictionary at index {index}")
-        return result_dict, index + 1
-
-    # String: <length>:<data>
-    elif char.isdigit():
-        colon_index = data.find(b":", index)
-        if colon_index == -1:
-            raise ValueError(f"No colon found for string at index {index}")
-        length = int(data[index:colon_index])
-        start_index = colon_index + 1
-        end_index = start_index + length
-        if end_index > len(data):
-            raise ValueError(f"String length exceeds data at index {index}")
-        value = data[start_index:end_index]
-        return value, end_index
 
-    else:
-        raise ValueError(f"Unexpected character '{char.decode('latin-1', errors='replace')}' at index {index}")
+    Raises:
+        ValueError: If the data is not valid bencode
+    """
+    data_len = len(data)
+    if key_strings is None:
+        key_strings = {}
+    # The innermost open list or dictionary and, for a dictionary, the key awaiting
+    # its value; enclosing containers and their keys are saved on the stack
+    container: Any = None
+    key: Any = _NO_KEY
+    stack: list[tuple[Any, Any]] = []
+
+    while True:
+        if index >= data_len:
+            if container is not None:
+                kind = "list" if type(container) is list else "dictionary"
+                raise ValueError(f"Unterminated {kind} at index {index}")
+            raise ValueError(f"Unexpected end of data at index {index}")
+
+        char = data[index]
+
+        # String: <length>:<data> (checked first, as keys and most values are strings)
+        if _DIGIT_0 <= char <= _DIGIT_9:
+            # Most keys and short values have a one-digit length, which needs
+            # neither a search for the colon nor a slice parsed by int()
+            if index + 1 < data_len and data[index + 1] == _COLON:
+                length = char - _DIGIT_0
+                start_index = index + 2
+            else:
+                # A colon further away than any real length could be is malformed input;
+                # bounding the search stops it from scanning the rest of the data
+                colon_index = data.find(b":", index, index + _MAX_LENGTH_DIGITS + 1)
+                if colon_index == -1:
+                    raise ValueError(f"No colon found for string at index {index}")
+                try:
+                    length = int(data[index:colon_index])
+                except ValueError as e:
+                    raise ValueError(f"Invalid string length at index {index}") from e
+                start_index = colon_index + 1
+
+            end_index = start_index + length
+            if end_index > data_len:
+                raise ValueError(f"String length exceeds data at index {index}")
+
+            value = data[start_index:end_index]
+            index = end_index
+
+        # Integer: i<number>e
+        elif char == _INT:
+            end_index = data.find(b"e", index + 1)
+            if end_index == -1:
+                raise ValueError(f"Unterminated integer at index {index}")
+            try:
+                value = int(data[index + 1 : end_index])
+            except ValueError as e:
+                raise ValueError(f"Invalid integer at index {index}") from e
+            index = end_index + 1
+
+        # End of the innermost list or dictionary (not allowed between a key and its value)
+        elif char == _END and container is not None and key is _NO_KEY:
+            value = container
+            container, key = stack.pop()
+            index += 1
+
+        # List: l<elements>e
+        elif char == _LIST:
+            stack.append((container, key))
+            container = []
+            key = _NO_KEY
+            index += 1
+            continue
+
+        # Dictionary: d<key-value pairs>e
+        elif char == _DICT:
+            stack.append((container, key))
+            container = {}
+            key = _NO_KEY
+            index += 1
+            continue
+
+        else:
+            raise ValueError(f"Unexpected character '{chr(char)}' at index {index}")
+
+        # Hand the finished value to its container, or return it if it is the outermost
+        if container is None:
+            return value, index
+        if type(container) is list:
+            container.append(value)
+        elif key is _NO_KEY:
+            # Dictionary keys are decoded to strings, each distinct key only once
+            if type(value) is bytes:
+                key = key_strings.get(value)
+                if key is None:
+                    key = key_strings[value] = value.decode("utf-8", errors="replace")
+            else:
+                key = value
+        else:
+            container[key] = value
+            key = _NO_KEY
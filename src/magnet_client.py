@@ -18,17 +18,18 @@ logger = logging.getLogger(__name__)
 class MetadataFetcher:
     """Fetches torrent metadata from peers using BEP 9."""
 
-    def __init__(self, magnet: MagnetLink, max_peers: int = 50) -> None:
+    def __init__(self, magnet: MagnetLink, max_peers: int = 50, peer_id: bytes | None = None) -> None:
         """
         Initialize the metadata fetcher.
 
         Args:
             magnet: Parsed magnet link
             max_peers: Maximum number of peers to try
+            peer_id: Peer ID to announce with (a new one is generated if omitted)
         """
         self.magnet = magnet
         self.max_peers = max_peers
-        self.peer_id = generate_peer_id()
+        self.peer_id = peer_id if peer_id is not None else generate_peer_id()
         self.port = 6881
         self.peers: dict[str, Peer] = {}
         self.metadata: bytes | None = None
@@ -56,6 +57,40 @@ class MetadataFetcher:
 
         return metadata
 
+    @classmethod
+    async def fetch_batch(cls, magnets: list[MagnetLink], max_peers: int = 50) -> list[bytes | None]:
+        """
+        Fetch metadata for several magnet links concurrently.
+
+        Magnets with the same info hash are only fetched once, and every fetcher
+        in the batch announces with the same peer ID.
+
+        Args:
+            magnets: Parsed magnet links
+            max_peers: Maximum number of peers to try per magnet
+
+        Returns:
+            Metadata bytes (or None on failure) for each magnet, in input order
+        """
+        peer_id = generate_peer_id()
+        fetchers: dict[bytes, MetadataFetcher] = {}
+        for magnet in magnets:
+            if magnet.info_hash not in fetchers:
+                fetchers[magnet.info_hash] = cls(magnet, max_peers=max_peers, peer_id=peer_id)
+
+        results = await asyncio.gather(*(fetcher.fetch() for fetcher in fetchers.values()), return_exceptions=True)
+
+        metadata_by_hash: dict[bytes, bytes | None] = {}
+        for info_hash, result in zip(fetchers, results, strict=True):
+            if isinstance(result, bytes):
+                metadata_by_hash[info_hash] = result
+            else:
+                if isinstance(result, Exception):
+                    logger.debug(f"Metadata fetch failed for {info_hash.hex()}: {result}")
+                metadata_by_hash[info_hash] = None
+
+        return [metadata_by_hash[magnet.info_hash] for magnet in magnets]
+
     async def _discover_peers(self) -> None:
         """Discover peers from trackers."""
         if not self.magnet.trackers:
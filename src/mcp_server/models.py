@@ -1,4 +1,9 @@
-"""Pydantic models for the MCP server."""
+"""
+Pydantic models for the MCP server.
+
+Tool handlers build these from values that are already well-typed, so they use
+``model_construct()`` to skip input validation on the response path.
+"""
 
 from datetime import datetime
 
@@ -1,5 +1,7 @@
 """MCP resources for browsing torrents and downloads."""
 
+import os
+
 from .models import DownloadStatus
 from .state import DEFAULT_DOWNLOADS_DIR, DEFAULT_TORRENTS_DIR, active_downloads
 from .utils import format_size
@@ -16,14 +18,15 @@ def register_resources(mcp) -> None:
         if not torrents_dir.exists():
             return "No torrent files found in the torrents directory."
 
-        torrent_files = []
-        for file_path in torrents_dir.glob("*.torrent"):
-            torrent_files.append(
+        with os.scandir(torrents_dir.resolve()) as entries:
+            torrent_files = [
                 {
-                    "path": str(file_path.absolute()),
-                    "name": file_path.name,
+                    "path": entry.path,
+                    "name": entry.name,
                 }
-            )
+                for entry in entries
+                if entry.name.endswith(".torrent") and entry.is_file(follow_symlinks=False)
+            ]
 
         if not torrent_files:
             return "No torrent files found in the torrents directory."
@@ -94,7 +97,7 @@ def register_resources(mcp) -> None:
                 total_bytes = client.parser.get_total_size() if client.parser else 0
 
                 results.append(
-                    DownloadStatus(
+                    DownloadStatus.model_construct(
                         torrent_name=download_info.get("name", "Unknown"),
                         info_hash=hash_id,
                         status=status,
@@ -105,13 +108,15 @@ def register_resources(mcp) -> None:
                         total_bytes=total_bytes,
                         active_peers=len(client.active_peers) if client else 0,
                         total_peers=len(client.peers) if client else 0,
-                        download_speed=f"{client._calculate_pieces_per_second():.2f} pieces/s" if client else None,
+                        download_speed=(
+                            f"{client._calculate_pieces_per_second():.2f} pieces/s" if status == "downloading" else None
+                        ),
                         error_message=download_info.get("error"),
                     )
                 )
             else:
                 results.append(
-                    DownloadStatus(
+                    DownloadStatus.model_construct(
                         torrent_name=download_info.get("name", "Unknown"),
                         info_hash=hash_id,
                         status=status,
@@ -5,6 +5,8 @@ This module initializes the FastMCP server and registers all tools and resources
 """
 
 import sys
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 # Add src to path for imports (needed for torrent_parser and mcp_server imports)
@@ -14,12 +16,26 @@ from fastmcp import FastMCP  # noqa: E402
 
 from mcp_server.resources import register_resources  # noqa: E402
 from mcp_server.tools import register_all_tools  # noqa: E402
+from mcp_server.tools.download_tools import stop_metadata_worker  # noqa: E402
+from tracker import Tracker  # noqa: E402
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Release the shared tracker session and UDP socket when the server stops."""
+    try:
+        yield
+    finally:
+        await stop_metadata_worker()
+        await Tracker.close()
+
 
 # Initialize FastMCP server
 mcp = FastMCP(
     "Vibe Torrent Client",
     instructions="A BitTorrent client MCP server for managing torrent downloads. "
     "Use the available tools to parse torrent files, start downloads, monitor progress, and manage downloads.",
+    lifespan=lifespan,
 )
 
 # Register all tools and resources
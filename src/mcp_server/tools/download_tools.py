@@ -13,6 +13,103 @@ from ..models import DownloadStatus
 from ..state import DEFAULT_DOWNLOADS_DIR, DEFAULT_TORRENTS_DIR, active_downloads
 from ..utils import resolve_torrent_path
 
+# Magnet metadata fetches are coalesced: requests queued within a short window
+# are handed to MetadataFetcher.fetch_batch together.
+_METADATA_BATCH_WINDOW = 0.05
+_METADATA_BATCH_SIZE = 16
+
+_metadata_fetch_queue: asyncio.Queue[tuple[MagnetLink, asyncio.Future]] | None = None
+_metadata_worker_task: asyncio.Task | None = None
+# Running batch tasks; the event loop only keeps weak references to tasks
+_metadata_batch_tasks: set[asyncio.Task] = set()
+
+
+async def _metadata_worker(queue: asyncio.Queue[tuple[MagnetLink, asyncio.Future]]) -> None:
+    """Drain queued magnet links and fetch their metadata in batches."""
+    while True:
+        batch = [await queue.get()]
+        await asyncio.sleep(_METADATA_BATCH_WINDOW)
+        while len(batch) < _METADATA_BATCH_SIZE:
+            try:
+                batch.append(queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+
+        # Run the batch in its own task so a slow swarm doesn't hold up later batches
+        task = asyncio.create_task(_run_metadata_batch(batch))
+        _metadata_batch_tasks.add(task)
+        task.add_done_callback(_metadata_batch_tasks.discard)
+
+
+async def _run_metadata_batch(batch: list[tuple[MagnetLink, asyncio.Future]]) -> None:
+    """Fetch metadata for a batch of magnets and resolve their futures."""
+    try:
+        results = await MetadataFetcher.fetch_batch([magnet for magnet, _ in batch])
+    except Exception as e:
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(e)
+        return
+
+    for (_, future), metadata in zip(batch, results, strict=True):
+        if not future.done():
+            future.set_result(metadata)
+
+
+async def _fetch_metadata(magnet: MagnetLink) -> bytes | None:
+    """
+    Queue a magnet link for batched metadata fetching.
+
+    Args:
+        magnet: Parsed magnet link
+
+    Returns:
+        Metadata bytes if successful, None otherwise
+    """
+    global _metadata_fetch_queue, _metadata_worker_task
+
+    # Started on first use so the queue and worker belong to the running event loop
+    if _metadata_worker_task is None or _metadata_worker_task.done():
+        _metadata_fetch_queue = asyncio.Queue()
+        _metadata_worker_task = asyncio.create_task(_metadata_worker(_metadata_fetch_queue))
+
+    future: asyncio.Future = asyncio.get_running_loop().create_future()
+    await _metadata_fetch_queue.put((magnet, future))
+    return await future
+
+
+async def stop_metadata_worker() -> None:
+    """Cancel the metadata worker and its running batches (called on server shutdown)."""
+    global _metadata_fetch_queue, _metadata_worker_task
+
+    tasks = list(_metadata_batch_tasks)
+    if _metadata_worker_task is not None:
+        tasks.append(_metadata_worker_task)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    # Fail requests still queued so their callers don't wait forever
+    if _metadata_fetch_queue is not None:
+        while not _metadata_fetch_queue.empty():
+            _, future = _metadata_fetch_queue.get_nowait()
+            future.cancel()
+
+    _metadata_fetch_queue = None
+    _metadata_worker_task = None
+
+
+def _download_summary(info: dict[str, Any]) -> dict[str, Any]:
+    """Build the list_active_downloads entry for a tracked download."""
+    return {
+        "info_hash": info["info_hash"],
+        "name": info.get("name", "Unknown"),
+        "status": info.get("status", "unknown"),
+        "started_at": info.get("started_at"),
+        "output_dir": info.get("output_dir"),
+        "error": info.get("error"),
+    }
+
 
 def register_download_tools(mcp) -> None:
     """Register download-related tools with the MCP server."""
@@ -68,6 +165,7 @@ def register_download_tools(mcp) -> None:
 
         # Track the download
         active_downloads[info_hash] = {
+            "info_hash": info_hash,
             "client": client,
             "status": "starting",
             "name": torrent.name,
@@ -134,6 +232,7 @@ def register_download_tools(mcp) -> None:
 
         # Track as fetching metadata
         active_downloads[info_hash] = {
+            "info_hash": info_hash,
             "client": None,
             "status": "fetching_metadata",
             "name": display_name,
@@ -145,9 +244,8 @@ def register_download_tools(mcp) -> None:
         # Start metadata fetch and download in background
         async def run_magnet_download() -> None:
             try:
-                # Fetch metadata
-                fetcher = MetadataFetcher(magnet)
-                metadata = await fetcher.fetch()
+                # Fetch metadata (batched with other pending magnet downloads)
+                metadata = await _fetch_metadata(magnet)
 
                 if not metadata:
                     active_downloads[info_hash]["status"] = "error"
@@ -216,7 +314,7 @@ def register_download_tools(mcp) -> None:
                 total_bytes = client.parser.get_total_size() if client.parser else 0
 
                 results.append(
-                    DownloadStatus(
+                    DownloadStatus.model_construct(
                         torrent_name=download_info.get("name", "Unknown"),
                         info_hash=hash_id,
                         status=status,
@@ -227,13 +325,15 @@ def register_download_tools(mcp) -> None:
                         total_bytes=total_bytes,
                         active_peers=len(client.active_peers) if client else 0,
                         total_peers=len(client.peers) if client else 0,
-                        download_speed=f"{client._calculate_pieces_per_second():.2f} pieces/s" if client else None,
+                        download_speed=(
+                            f"{client._calculate_pieces_per_second():.2f} pieces/s" if status == "downloading" else None
+                        ),
                         error_message=download_info.get("error"),
                     )
                 )
             else:
                 results.append(
-                    DownloadStatus(
+                    DownloadStatus.model_construct(
                         torrent_name=download_info.get("name", "Unknown"),
                         info_hash=hash_id,
                         status=status,
@@ -291,14 +391,4 @@ def register_download_tools(mcp) -> None:
         Returns:
             List of downloads with their basic information and status.
         """
-        return [
-            {
-                "info_hash": hash_id,
-                "name": info.get("name", "Unknown"),
-                "status": info.get("status", "unknown"),
-                "started_at": info.get("started_at"),
-                "output_dir": info.get("output_dir"),
-                "error": info.get("error"),
-            }
-            for hash_id, info in active_downloads.items()
-        ]
+        return list(map(_download_summary, active_downloads.values()))
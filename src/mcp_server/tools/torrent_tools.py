@@ -1,13 +1,13 @@
 """Torrent parsing and listing tools."""
 
+import os
 from pathlib import Path
 
 from magnet import MagnetError, MagnetLink, is_magnet_link
-from torrent_parser import BencodeError, TorrentParser
 
 from ..models import MagnetInfo, TorrentFileInfo, TorrentMetadata
 from ..state import DEFAULT_TORRENTS_DIR
-from ..utils import resolve_torrent_path
+from ..utils import load_torrent, prefetch_torrents, resolve_torrent_path
 
 
 def register_torrent_tools(mcp) -> None:
@@ -16,6 +16,7 @@ def register_torrent_tools(mcp) -> None:
     @mcp.tool()
     def list_torrent_files(
         directory: str | None = None,
+        prefetch: bool = False,
     ) -> list[dict[str, str]]:
         """
         List all .torrent files in a directory.
@@ -23,6 +24,8 @@ def register_torrent_tools(mcp) -> None:
         Args:
             directory: Path to directory containing .torrent files.
                        Defaults to the 'torrents' folder in the project.
+            prefetch: Parse the listed torrents in the background so that
+                      follow-up parse/info-hash queries are answered from cache.
 
         Returns:
             List of torrent files with their paths and names.
@@ -32,16 +35,22 @@ def register_torrent_tools(mcp) -> None:
         if not torrents_dir.exists():
             return []
 
-        torrent_files = []
-        for file_path in torrents_dir.glob("*.torrent"):
-            torrent_files.append(
+        # Resolve once so entry.path is already absolute; scandir + a suffix check
+        # avoids glob pattern matching and a Path per entry
+        with os.scandir(torrents_dir.resolve()) as entries:
+            files = [
                 {
-                    "path": str(file_path.absolute()),
-                    "name": file_path.name,
+                    "path": entry.path,
+                    "name": entry.name,
                 }
-            )
+                for entry in entries
+                if entry.name.endswith(".torrent") and entry.is_file(follow_symlinks=False)
+            ]
+
+        if prefetch:
+            prefetch_torrents([Path(f["path"]) for f in files])
 
-        return torrent_files
+        return files
 
     @mcp.tool()
     def parse_torrent(
@@ -58,34 +67,31 @@ def register_torrent_tools(mcp) -> None:
         """
         path = resolve_torrent_path(torrent_path, DEFAULT_TORRENTS_DIR)
 
-        try:
-            parser = TorrentParser(str(path))
-            torrent = parser.parse()
-
-            files = [
-                TorrentFileInfo(
-                    path=f.full_path,
-                    size_bytes=f.length,
-                    size_formatted=f.format_size(),
-                )
-                for f in torrent.get_files()
-            ]
+        parsed = load_torrent(path)
+        torrent = parsed.torrent
 
-            return TorrentMetadata(
-                name=torrent.name,
-                info_hash=parser.get_info_hash(),
-                total_size_bytes=torrent.total_size,
-                total_size_formatted=torrent.format_size(),
-                piece_length=torrent.piece_length,
-                piece_count=torrent.piece_count,
-                files=files,
-                announce_urls=torrent.get_announce_urls(),
-                creation_date=torrent.creation_datetime,
-                created_by=torrent.created_by,
-                comment=torrent.comment,
+        files = [
+            TorrentFileInfo.model_construct(
+                path=f.full_path,
+                size_bytes=f.length,
+                size_formatted=f.format_size(),
             )
-        except BencodeError as e:
-            raise ValueError(f"Failed to parse torrent file: {e}") from e
+            for f in torrent.get_files()
+        ]
+
+        return TorrentMetadata.model_construct(
+            name=torrent.name,
+            info_hash=parsed.info_hash,
+            total_size_bytes=torrent.total_size,
+            total_size_formatted=torrent.format_size(),
+            piece_length=torrent.piece_length,
+            piece_count=torrent.piece_count,
+            files=files,
+            announce_urls=torrent.get_announce_urls(),
+            creation_date=torrent.creation_datetime,
+            created_by=torrent.created_by,
+            comment=torrent.comment,
+        )
 
     @mcp.tool()
     def get_torrent_info_hash(
@@ -105,9 +111,7 @@ def register_torrent_tools(mcp) -> None:
         """
         path = resolve_torrent_path(torrent_path, DEFAULT_TORRENTS_DIR)
 
-        parser = TorrentParser(str(path))
-        parser.parse()
-        return parser.get_info_hash()
+        return load_torrent(path).info_hash
 
     @mcp.tool()
     def get_torrent_files(
@@ -124,11 +128,10 @@ def register_torrent_tools(mcp) -> None:
         """
         path = resolve_torrent_path(torrent_path, DEFAULT_TORRENTS_DIR)
 
-        parser = TorrentParser(str(path))
-        torrent = parser.parse()
+        torrent = load_torrent(path).torrent
 
         return [
-            TorrentFileInfo(
+            TorrentFileInfo.model_construct(
                 path=f.full_path,
                 size_bytes=f.length,
                 size_formatted=f.format_size(),
@@ -153,9 +156,7 @@ def register_torrent_tools(mcp) -> None:
         """
         path = resolve_torrent_path(torrent_path, DEFAULT_TORRENTS_DIR)
 
-        parser = TorrentParser(str(path))
-        torrent = parser.parse()
-        return torrent.get_announce_urls()
+        return load_torrent(path).torrent.get_announce_urls()
 
     @mcp.tool()
     def parse_magnet_link(
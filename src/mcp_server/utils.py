@@ -1,16 +1,25 @@
 """Utility functions for the MCP server."""
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
+from torrent_parser import BencodeError, Torrent, TorrentParser
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+_SIZE_DIVISORS = tuple(1 << (10 * i) for i in range(len(_SIZE_UNITS)))
+
+# Background workers that warm the load_torrent cache
+_PREFETCH_WORKERS = 8
+_prefetch_executor: ThreadPoolExecutor | None = None
+
 
 def format_size(size_bytes: int) -> str:
     """Format bytes into human-readable size."""
-    size = float(size_bytes)
-    for unit in ["B", "KB", "MB", "GB", "TB"]:
-        if size < 1024.0:
-            return f"{size:.2f} {unit}"
-        size /= 1024.0
-    return f"{size:.2f} PB"
+    # Each unit is 2**10 times the previous one, so the unit index falls out of the bit length
+    unit_index = min((max(size_bytes, 1).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / _SIZE_DIVISORS[unit_index]:.2f} {_SIZE_UNITS[unit_index]}"
 
 
 def resolve_torrent_path(torrent_path: str, default_torrents_dir: Path) -> Path:
@@ -36,3 +45,66 @@ def resolve_torrent_path(torrent_path: str, default_torrents_dir: Path) -> Path:
         raise FileNotFoundError(f"Torrent file not found: {torrent_path}")
 
     return path
+
+
+@dataclass(frozen=True)
+class ParsedTorrent:
+    """A decoded .torrent file together with its info hash."""
+
+    torrent: Torrent
+    info_hash: str
+
+
+def load_torrent(path: Path) -> ParsedTorrent:
+    """
+    Load a .torrent file, reusing the previous result if the file is unchanged.
+
+    Args:
+        path: Path to the .torrent file.
+
+    Returns:
+        The parsed torrent and its info hash.
+
+    Raises:
+        ValueError: If the file is not valid bencode.
+    """
+    stat = path.stat()
+    return _load_torrent_cached(str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=256)
+def _load_torrent_cached(path_str: str, mtime_ns: int, size: int) -> ParsedTorrent:
+    """Parse a .torrent file; mtime_ns and size are only part of the cache key."""
+    parser = TorrentParser(path_str)
+    try:
+        torrent = parser.parse()
+        return ParsedTorrent(torrent=torrent, info_hash=parser.get_info_hash())
+    except BencodeError as e:
+        raise ValueError(f"Failed to parse torrent file: {e}") from e
+
+
+def prefetch_torrents(paths: list[Path]) -> None:
+    """
+    Parse torrent files in the background so later load_torrent calls hit the cache.
+
+    Returns immediately; parse errors are ignored here and reported when the
+    file is actually loaded.
+
+    Args:
+        paths: Paths to .torrent files.
+    """
+    global _prefetch_executor
+    if not paths:
+        return
+    if _prefetch_executor is None:
+        _prefetch_executor = ThreadPoolExecutor(max_workers=_PREFETCH_WORKERS, thread_name_prefix="torrent-prefetch")
+    for path in paths:
+        _prefetch_executor.submit(_prefetch_one, path)
+
+
+def _prefetch_one(path: Path) -> None:
+    """Load one torrent into the cache, ignoring failures."""
+    try:
+        load_torrent(path)
+    except (OSError, ValueError):
+        pass
@@ -10,7 +10,14 @@ import struct
 from enum import IntEnum
 from typing import Any
 
+from bitfield import bitfield_size, count_bits, has_bit, intersects, merge_into, set_bit
 from magnet import bencode_decode, bencode_encode
+from peer_protocol import PeerProtocol, open_peer_connection
+
+try:
+    from fastbencode import bdecode as _fast_bdecode
+except ImportError:  # fastbencode is an optional speedup; fall back to the pure-Python decoder
+    _fast_bdecode = None
 
 
 class MessageType(IntEnum):
@@ -30,10 +37,139 @@ class MessageType(IntEnum):
     KEEP_ALIVE = -1  # Special case: no message ID, length = 0
 
 
+# MessageType by wire ID (None for unassigned IDs); indexing avoids the IntEnum constructor per message
+_MESSAGE_TYPES: tuple[MessageType | None, ...] = tuple(
+    next((member for member in MessageType if member == message_id), None) for message_id in range(max(MessageType) + 1)
+)
+
 # Extension message IDs (BEP 10)
 EXTENSION_HANDSHAKE = 0
 UT_METADATA = 1  # Our local ID for ut_metadata extension
 
+# Precompiled wire formats
+_LEN = struct.Struct(">I")  # Message length prefix
+_LEN_ID = struct.Struct(">IB")  # Length prefix + message ID
+_HAVE = struct.Struct(">I")  # HAVE payload: <index>
+_REQ = struct.Struct(">III")  # REQUEST/CANCEL payload: <index><begin><length>
+_HANDSHAKE = struct.Struct(">B19s8s20s20s")  # <pstrlen><pstr><reserved><info_hash><peer_id>
+
+# Handshake constants
+_PROTOCOL = b"BitTorrent protocol"
+_HANDSHAKE_PREFIX = bytes([len(_PROTOCOL)]) + _PROTOCOL
+# Handshake fields after the 20-byte prefix: <reserved><info_hash><peer_id>
+_HANDSHAKE_TAIL = struct.Struct(">8s20s20s")
+_NO_EXTENSIONS_RESERVED = bytes(8)
+# Reserved bit 20 from the right (byte 5, bit 4) advertises extension support (BEP 10)
+_EXTENSIONS_RESERVED = bytes([0, 0, 0, 0, 0, 0x10, 0, 0])
+
+# Complete REQUEST message: <length=13><id=6><index><begin><length>
+_REQUEST_MESSAGE = struct.Struct(">IBIII")
+# Complete HAVE message: <length=5><id=4><index>
+_HAVE_MESSAGE = struct.Struct(">IBI")
+
+# Maximum number of ut_metadata piece requests in flight
+_METADATA_REQUEST_WINDOW = 16
+# Reusable receive buffer for ut_metadata messages (16 KiB of data plus the bencoded header)
+_METADATA_RECEIVE_BUFFER_SIZE = 16 * 1024 + 1024
+# Leading bytes of a ut_metadata message expected to hold the whole bencoded header
+_METADATA_HEADER_LIMIT = 256
+
+# Piece indices accepted from a peer while the torrent's piece count is unknown (bounds its bitfield to 256 KiB)
+_MAX_PIECE_COUNT = 1 << 21
+
+# HAVE announcements queued within this many seconds go out in one write
+_HAVE_FLUSH_DELAY = 0.01
+
+
+def _decode_extension_dict(payload: bytes) -> Any:
+    """
+    Decode a complete bencoded extension handshake payload.
+
+    Uses fastbencode when it is installed. Its dictionaries have bytes keys, so the
+    top-level and "m" keys are converted to str to match the pure-Python decoder.
+
+    Args:
+        payload: Bencoded payload (nothing may follow the value)
+
+    Returns:
+        Decoded value
+    """
+    if _fast_bdecode is None:
+        return bencode_decode(payload)[0]
+    try:
+        decoded = _fast_bdecode(payload)
+    except ValueError:
+        # Let the pure-Python decoder handle (or report) anything fastbencode rejects
+        return bencode_decode(payload)[0]
+    if not isinstance(decoded, dict):
+        return decoded
+
+    result = {_key_to_str(key): value for key, value in decoded.items()}
+    if isinstance(result.get("m"), dict):
+        result["m"] = {_key_to_str(key): value for key, value in result["m"].items()}
+    return result
+
+
+def _key_to_str(key: Any) -> Any:
+    """Decode a bytes dictionary key the same way the pure-Python decoder does."""
+    return key.decode("utf-8", errors="replace") if isinstance(key, bytes) else key
+
+
+def _build_extension_handshake(metadata_size: int | None = None) -> bytes:
+    """
+    Build a complete EXTENDED message carrying our extension handshake.
+
+    Args:
+        metadata_size: If we have metadata, include its size
+
+    Returns:
+        Framed message bytes
+    """
+    # Build extension handshake dictionary
+    handshake_dict: dict[str, Any] = {
+        "m": {
+            "ut_metadata": UT_METADATA,  # Advertise ut_metadata support
+        },
+    }
+
+    if metadata_size is not None:
+        handshake_dict["metadata_size"] = metadata_size
+
+    # Encode the handshake
+    payload = bencode_encode(handshake_dict)
+
+    # Extension message format: <length><id=20><extended_message_id><payload>
+    # For handshake, extended_message_id = 0
+    return _LEN_ID.pack(2 + len(payload), MessageType.EXTENDED) + bytes([EXTENSION_HANDSHAKE]) + payload
+
+
+def _extension_handshake_message(metadata_size: int | None = None) -> bytes:
+    """Get our framed extension handshake, reusing the pre-encoded one when no metadata_size is given."""
+    if metadata_size is None:
+        return _EXTENSION_HANDSHAKE_MESSAGE
+    return _build_extension_handshake(metadata_size)
+
+
+# Our extension handshake never changes unless we advertise a metadata size, so encode it once
+_EXTENSION_HANDSHAKE_MESSAGE = _build_extension_handshake()
+
+
+def _metadata_request_message(ut_metadata_id: int, piece_index: int) -> bytes:
+    """
+    Build a complete EXTENDED message requesting one metadata piece (BEP 9).
+
+    Args:
+        ut_metadata_id: The peer's extended message ID for ut_metadata
+        piece_index: Index of the metadata piece to request
+
+    Returns:
+        Framed message bytes
+    """
+    # The request is a fixed two-key dict, so format its bencoding directly:
+    # {"msg_type": REQUEST, "piece": piece_index}
+    message = b"%cd8:msg_typei%de5:piecei%dee" % (ut_metadata_id, ExtendedMessageType.REQUEST, piece_index)
+    return _LEN_ID.pack(len(message) + 1, MessageType.EXTENDED) + message
+
 
 class ExtendedMessageType(IntEnum):
     """Extended message types for ut_metadata (BEP 9)."""
@@ -52,7 +188,7 @@ class PeerError(Exception):
 class Peer:
     """Represents a BitTorrent peer connection."""
 
-    def __init__(self, ip: str, port: int, info_hash: bytes, peer_id: bytes) -> None:
+    def __init__(self, ip: str, port: int, info_hash: bytes, peer_id: bytes, piece_count: int = 0) -> None:
         """
         Initialize peer connection.
 
@@ -61,22 +197,27 @@ class Peer:
             port: Peer port
             info_hash: SHA-1 hash of the info dictionary
             peer_id: Our peer ID
+            piece_count: Number of pieces in the torrent (0 if unknown, bitfields then grow on demand
+                up to _MAX_PIECE_COUNT pieces)
         """
         self.ip = ip
         self.port = port
         self.info_hash = info_hash
         self.peer_id = peer_id
-        self.reader: asyncio.StreamReader | None = None
-        self.writer: asyncio.StreamWriter | None = None
+        # The same PeerProtocol serves as reader and writer once connected
+        self.reader: PeerProtocol | None = None
+        self.writer: PeerProtocol | None = None
         self.remote_peer_id: bytes | None = None
-        self.bitfield: set[int] | None = None
+        # Pieces the peer has (one bit per piece, high bit of byte 0 = piece 0)
+        self.bitfield = bytearray(bitfield_size(piece_count))
+        # Highest piece index + 1 accepted in the peer's HAVE and BITFIELD messages
+        self.piece_limit = piece_count or _MAX_PIECE_COUNT
         self.choked = True
         self.interested = False
         self.remote_choked = True
         self.remote_interested = False
         self.connected = False
-        self.pieces_have: set[int] = set()
-        self.counted_pieces: set[int] = set()
+        self.counted_pieces = bytearray(bitfield_size(piece_count))  # Pieces already counted in availability
 
         # Extension protocol (BEP 10 / BEP 9)
         self.supports_extensions = False
@@ -84,6 +225,14 @@ class Peer:
         self.remote_extensions: dict[str, int] = {}  # Extension name -> message ID
         self.metadata_size: int | None = None  # Size of metadata if peer supports ut_metadata
 
+        # Outgoing handshakes never change for a peer, so pack them once
+        self._handshake_bytes = _HANDSHAKE.pack(19, _PROTOCOL, _NO_EXTENSIONS_RESERVED, info_hash, peer_id)
+        self._extension_handshake_bytes = _HANDSHAKE.pack(19, _PROTOCOL, _EXTENSIONS_RESERVED, info_hash, peer_id)
+
+        # Pending HAVE announcements (see send_have)
+        self._have_queue: list[int] = []
+        self._have_flush_handle: asyncio.TimerHandle | None = None
+
     async def connect(self, timeout: float = 10.0) -> bool:
         """
         Connect to peer and perform handshake.
@@ -95,9 +244,8 @@ class Peer:
             True if connection successful, False otherwise
         """
         try:
-            self.reader, self.writer = await asyncio.wait_for(
-                asyncio.open_connection(self.ip, self.port), timeout=timeout
-            )
+            connection = await asyncio.wait_for(open_peer_connection(self.ip, self.port), timeout=timeout)
+            self.reader = self.writer = connection
 
             # Perform handshake
             await self._handshake()
@@ -112,6 +260,10 @@ class Peer:
 
     async def _safe_close(self) -> None:
         """Best-effort close of the underlying stream."""
+        if self._have_flush_handle:
+            self._have_flush_handle.cancel()
+            self._have_flush_handle = None
+        self._have_queue.clear()
         if self.writer:
             self.writer.close()
             try:
@@ -122,12 +274,13 @@ class Peer:
         self.reader = None
         self.writer = None
 
-    async def _handshake(self, support_extensions: bool = False) -> None:
+    async def _handshake(self, support_extensions: bool = False, trailer: bytes = b"") -> None:
         """
         Perform BitTorrent handshake.
 
         Args:
             support_extensions: If True, advertise extension protocol support (BEP 10)
+            trailer: Already-framed messages to send in the same write as the handshake
         """
         # Handshake format:
         # <pstrlen><pstr><reserved><info_hash><peer_id>
@@ -135,50 +288,35 @@ class Peer:
         # pstrlen = 19
         # reserved = 8 bytes
         #   - Bit 20 (0x00100000) indicates extension protocol support (BEP 10)
+        handshake = self._extension_handshake_bytes if support_extensions else self._handshake_bytes
 
-        reserved = bytearray(8)
-        if support_extensions:
-            # Set bit 20 from the right (byte 5, bit 4) to indicate extension support
-            reserved[5] |= 0x10
-
-        handshake = struct.pack(
-            ">B19s8s20s20s",
-            19,  # pstrlen
-            b"BitTorrent protocol",  # pstr
-            bytes(reserved),  # reserved
-            self.info_hash,
-            self.peer_id,
-        )
-
-        self.writer.write(handshake)
+        self.writer.write(handshake + trailer if trailer else handshake)
         await self.writer.drain()
 
         # Read response
-        response = await self.reader.read(68)  # 1 + 19 + 8 + 20 + 20 = 68
-
-        if len(response) < 68:
-            raise PeerError("Invalid handshake response length")
+        try:
+            response = await self.reader.readexactly(_HANDSHAKE.size)  # 1 + 19 + 8 + 20 + 20 = 68
+        except asyncio.IncompleteReadError as e:
+            raise PeerError("Invalid handshake response length") from e
 
-        pstrlen = response[0]
-        if pstrlen != 19:
-            raise PeerError(f"Invalid protocol string length: {pstrlen}")
+        # Reject junk with a prefix compare before unpacking anything
+        if not response.startswith(_HANDSHAKE_PREFIX):
+            if response[0] != 19:
+                raise PeerError(f"Invalid protocol string length: {response[0]}")
+            raise PeerError(f"Invalid protocol string: {response[1:20]}")
 
-        pstr = response[1:20]
-        if pstr != b"BitTorrent protocol":
-            raise PeerError(f"Invalid protocol string: {pstr}")
+        remote_reserved, response_info_hash, remote_peer_id = _HANDSHAKE_TAIL.unpack_from(response, 20)
 
         # Check if peer supports extensions (bit 20 from right = byte 5, bit 4)
-        remote_reserved = response[20:28]
         self.supports_extensions = bool(remote_reserved[5] & 0x10)
-
-        # Extract info_hash and peer_id
-        response_info_hash = response[28:48]
-        self.remote_peer_id = response[48:68]
+        self.remote_peer_id = remote_peer_id
 
         if response_info_hash != self.info_hash:
             raise PeerError("Info hash mismatch in handshake")
 
-    async def send_message(self, message_type: MessageType, payload: bytes = b"", drain: bool = True) -> None:
+    async def send_message(
+        self, message_type: MessageType, payload: bytes | memoryview = b"", drain: bool = True
+    ) -> None:
         """
         Send a message to the peer.
 
@@ -192,13 +330,15 @@ class Peer:
 
         if message_type == MessageType.KEEP_ALIVE:
             # Keep-alive: 4 bytes of zeros (length = 0)
-            message = struct.pack(">I", 0)
-        else:
+            self.writer.write(_LEN.pack(0))
+        elif payload:
             # Message format: <length><message_id><payload>
-            # length = 1 + len(payload)
-            message = struct.pack(">IB", 1 + len(payload), message_type) + payload
+            # length = 1 + len(payload); the payload is handed to the transport
+            # as-is rather than copied into a concatenated message
+            self.writer.writelines((_LEN_ID.pack(1 + len(payload), message_type), payload))
+        else:
+            self.writer.write(_LEN_ID.pack(1, message_type))
 
-        self.writer.write(message)
         if drain:
             await self.writer.drain()
 
@@ -207,10 +347,14 @@ class Peer:
         if self.writer:
             await self.writer.drain()
 
-    async def receive_message(self, timeout: float | None = None) -> tuple[MessageType, bytes]:
+    async def receive_message(self, timeout: float | None = None) -> tuple[MessageType, bytes | memoryview]:
         """
         Receive a message from the peer.
 
+        The payload is a read-only memoryview over the received message rather
+        than a copy of it. Callers that need real bytes (e.g. for bencode
+        decoding) must convert it with bytes().
+
         Args:
             timeout: Optional timeout in seconds
 
@@ -220,27 +364,84 @@ class Peer:
         if not self.reader:
             raise PeerError("Not connected to peer")
 
+        # One timer covers the whole frame, and only the reads themselves are guarded
         try:
-            # Read message length (4 bytes)
-            length_data = await asyncio.wait_for(self.reader.readexactly(4), timeout=timeout)
-            length = struct.unpack(">I", length_data)[0]
+            async with asyncio.timeout(timeout):
+                # Read message length (4 bytes)
+                length = _LEN.unpack_from(await self.reader.readexactly(4))[0]
+
+                # Keep-alive message
+                if length == 0:
+                    return (MessageType.KEEP_ALIVE, b"")
+
+                # Read message ID and payload. PeerProtocol receives into one reusable
+                # buffer and copies each frame out exactly once, so the payload views
+                # returned below never alias that buffer.
+                message_data = await self.reader.readexactly(length)
+        except TimeoutError as e:
+            raise PeerError("Message receive timeout") from e
+        except (asyncio.IncompleteReadError, ConnectionError, OSError) as e:
+            raise PeerError(f"Error receiving message: {e}") from e
+
+        message_id = message_data[0]
+        message_type = _MESSAGE_TYPES[message_id] if message_id < len(_MESSAGE_TYPES) else None
+        if message_type is None:
+            raise PeerError(f"Unknown message ID {message_id}")
+
+        # Messages without a payload (CHOKE, UNCHOKE, INTERESTED, ...)
+        if length == 1:
+            return (message_type, b"")
+
+        return (message_type, memoryview(message_data)[1:])
 
-            # Keep-alive message
-            if length == 0:
-                return (MessageType.KEEP_ALIVE, b"")
+    async def receive_message_into(
+        self, buffer: bytearray, timeout: float | None = None
+    ) -> tuple[MessageType, bytes | memoryview]:
+        """
+        Receive a message from the peer into a caller-supplied buffer.
 
-            # Read message ID and payload
-            message_data = await asyncio.wait_for(self.reader.readexactly(length), timeout=timeout)
+        The payload is read straight from the connection's receive buffer into
+        buffer, so no per-message bytes object is allocated. The returned view
+        aliases buffer and is only valid until the next call with the same
+        buffer. Messages larger than buffer are read into a new bytes object.
 
-            message_id = message_data[0]
-            payload = message_data[1:] if len(message_data) > 1 else b""
+        Args:
+            buffer: Reusable buffer to receive the message ID and payload into
+            timeout: Optional timeout in seconds
 
-            return (MessageType(message_id), payload)
+        Returns:
+            Tuple of (message_type, payload)
+        """
+        if not self.reader:
+            raise PeerError("Not connected to peer")
+
+        try:
+            async with asyncio.timeout(timeout):
+                length = _LEN.unpack_from(await self.reader.readexactly(4))[0]
+
+                if length == 0:
+                    return (MessageType.KEEP_ALIVE, b"")
+
+                if length > len(buffer):
+                    message_data = memoryview(await self.reader.readexactly(length))
+                else:
+                    message_data = memoryview(buffer)[:length]
+                    await self.reader.readinto(message_data)
         except TimeoutError as e:
             raise PeerError("Message receive timeout") from e
-        except Exception as e:
+        except (asyncio.IncompleteReadError, ConnectionError, OSError) as e:
             raise PeerError(f"Error receiving message: {e}") from e
 
+        message_id = message_data[0]
+        message_type = _MESSAGE_TYPES[message_id] if message_id < len(_MESSAGE_TYPES) else None
+        if message_type is None:
+            raise PeerError(f"Unknown message ID {message_id}")
+
+        if length == 1:
+            return (message_type, b"")
+
+        return (message_type, message_data[1:])
+
     async def send_interested(self) -> None:
         """Send INTERESTED message."""
         await self.send_message(MessageType.INTERESTED)
@@ -257,10 +458,33 @@ class Peer:
         self.choked = False
 
     async def send_have(self, piece_index: int) -> None:
-        """Send HAVE message."""
-        payload = struct.pack(">I", piece_index)
-        await self.send_message(MessageType.HAVE, payload)
-        self.pieces_have.add(piece_index)
+        """
+        Queue a HAVE message.
+
+        Announcements made in quick succession (e.g. a burst of completed
+        pieces) are coalesced and written together after a short delay.
+
+        Args:
+            piece_index: Index of the piece we now have
+        """
+        if not self.writer:
+            raise PeerError("Not connected to peer")
+
+        self._have_queue.append(piece_index)
+        set_bit(self.bitfield, piece_index)
+        if self._have_flush_handle is None:
+            self._have_flush_handle = asyncio.get_running_loop().call_later(_HAVE_FLUSH_DELAY, self._flush_haves)
+
+    def _flush_haves(self) -> None:
+        """Write all queued HAVE messages in a single write."""
+        self._have_flush_handle = None
+        if not self.writer or not self._have_queue:
+            return
+
+        pack = _HAVE_MESSAGE.pack
+        have_id = MessageType.HAVE
+        self.writer.write(b"".join([pack(5, have_id, piece_index) for piece_index in self._have_queue]))
+        self._have_queue.clear()
 
     async def send_request(self, piece_index: int, block_offset: int, block_length: int, drain: bool = True) -> None:
         """
@@ -272,42 +496,55 @@ class Peer:
             block_length: Length of the block (typically 16KB)
             drain: Whether to drain the write buffer immediately
         """
-        payload = struct.pack(">III", piece_index, block_offset, block_length)
+        payload = _REQ.pack(piece_index, block_offset, block_length)
         await self.send_message(MessageType.REQUEST, payload, drain=drain)
 
+    async def send_requests_batch(self, blocks: list[tuple[int, int, int]], drain: bool = True) -> None:
+        """
+        Send REQUEST messages for several blocks with a single write.
+
+        Args:
+            blocks: List of (piece_index, block_offset, block_length) tuples
+            drain: Whether to drain the write buffer after writing
+        """
+        if not self.writer:
+            raise PeerError("Not connected to peer")
+        if not blocks:
+            return
+
+        pack = _REQUEST_MESSAGE.pack
+        request_id = MessageType.REQUEST
+        self.writer.write(b"".join([pack(13, request_id, index, offset, length) for index, offset, length in blocks]))
+        if drain:
+            await self.writer.drain()
+
     async def send_cancel(self, piece_index: int, block_offset: int, block_length: int) -> None:
         """Send CANCEL message."""
-        payload = struct.pack(">III", piece_index, block_offset, block_length)
+        payload = _REQ.pack(piece_index, block_offset, block_length)
         await self.send_message(MessageType.CANCEL, payload)
 
-    async def handle_bitfield(self, payload: bytes) -> None:
+    async def handle_bitfield(self, payload: bytes | memoryview) -> None:
         """
         Handle BITFIELD message from peer.
 
         Args:
-            payload: Bitfield data
+            payload: Bitfield data (bytes past the piece count are ignored)
         """
-        self.bitfield = set()
-        for byte_index, byte_value in enumerate(payload):
-            for bit_index in range(8):
-                if byte_value & (1 << (7 - bit_index)):
-                    piece_index = byte_index * 8 + bit_index
-                    self.bitfield.add(piece_index)
-                    self.pieces_have.add(piece_index)
+        merge_into(self.bitfield, payload, bitfield_size(self.piece_limit))
 
-    async def handle_have(self, payload: bytes) -> None:
+    async def handle_have(self, payload: bytes | memoryview) -> None:
         """
         Handle HAVE message from peer.
 
         Args:
-            payload: Piece index (4 bytes)
+            payload: Piece index (4 bytes; indices past the piece count are ignored)
         """
         if len(payload) != 4:
             return
-        piece_index = struct.unpack(">I", payload)[0]
-        self.pieces_have.add(piece_index)
-        if self.bitfield is not None:
-            self.bitfield.add(piece_index)
+        piece_index = _HAVE.unpack_from(payload)[0]
+        if piece_index >= self.piece_limit:
+            return
+        set_bit(self.bitfield, piece_index)
 
     async def handle_unchoke(self) -> None:
         """Handle UNCHOKE message from peer."""
@@ -327,9 +564,28 @@ class Peer:
         Returns:
             True if peer has the piece
         """
-        if self.bitfield:
-            return piece_index in self.bitfield
-        return piece_index in self.pieces_have
+        return has_bit(self.bitfield, piece_index)
+
+    def has_any_wanted(self, wanted: bytes | bytearray) -> bool:
+        """
+        Check if peer has at least one piece we still want.
+
+        Args:
+            wanted: Bitfield of the pieces we still need
+
+        Returns:
+            True if the peer has any wanted piece
+        """
+        return intersects(self.bitfield, wanted)
+
+    def piece_count(self) -> int:
+        """
+        Get the number of pieces the peer has.
+
+        Returns:
+            Number of set bits in the peer's bitfield
+        """
+        return count_bits(self.bitfield)
 
     async def disconnect(self) -> None:
         """Close connection to peer."""
@@ -344,23 +600,11 @@ class Peer:
         Args:
             metadata_size: If we have metadata, include its size
         """
-        # Build extension handshake dictionary
-        handshake_dict: dict[str, Any] = {
-            "m": {
-                "ut_metadata": UT_METADATA,  # Advertise ut_metadata support
-            },
-        }
-
-        if metadata_size is not None:
-            handshake_dict["metadata_size"] = metadata_size
-
-        # Encode the handshake
-        payload = bencode_encode(handshake_dict)
+        if not self.writer:
+            raise PeerError("Not connected to peer")
 
-        # Extension message format: <extended_message_id><payload>
-        # For handshake, extended_message_id = 0
-        message = bytes([EXTENSION_HANDSHAKE]) + payload
-        await self.send_message(MessageType.EXTENDED, message)
+        self.writer.write(_extension_handshake_message(metadata_size))
+        await self.writer.drain()
 
     async def handle_extension_message(self, payload: bytes) -> tuple[int, dict[str, Any] | bytes]:
         """
@@ -376,11 +620,11 @@ class Peer:
             raise PeerError("Empty extension message")
 
         ext_msg_id = payload[0]
-        ext_payload = payload[1:]
+        ext_payload = bytes(payload[1:])
 
         if ext_msg_id == EXTENSION_HANDSHAKE:
             # Decode extension handshake
-            decoded, _ = bencode_decode(ext_payload)
+            decoded = _decode_extension_dict(ext_payload)
             self.extension_handshake_received = True
 
             # Extract supported extensions
@@ -400,29 +644,7 @@ class Peer:
             # Other extension message - return raw payload
             return (ext_msg_id, ext_payload)
 
-    async def request_metadata_piece(self, piece_index: int) -> None:
-        """
-        Request a metadata piece from peer (BEP 9).
-
-        Args:
-            piece_index: Index of the metadata piece to request
-        """
-        if "ut_metadata" not in self.remote_extensions:
-            raise PeerError("Peer does not support ut_metadata")
-
-        remote_ut_metadata_id = self.remote_extensions["ut_metadata"]
-
-        # Build request message
-        request_dict = {
-            "msg_type": ExtendedMessageType.REQUEST,
-            "piece": piece_index,
-        }
-
-        payload = bencode_encode(request_dict)
-        message = bytes([remote_ut_metadata_id]) + payload
-        await self.send_message(MessageType.EXTENDED, message)
-
-    def parse_metadata_response(self, payload: bytes) -> tuple[int, int, bytes | None]:
+    def parse_metadata_response(self, payload: bytes | memoryview) -> tuple[int, int, memoryview | None]:
         """
         Parse a metadata response from peer.
 
@@ -431,12 +653,17 @@ class Peer:
 
         Returns:
             Tuple of (msg_type, piece_index, data_or_none)
-            data_or_none is the metadata piece data for DATA messages, None for REJECT
+            data_or_none is a view of the metadata piece data for DATA messages, None for REJECT
         """
         # The payload is: <bencoded dict><raw metadata data>
         # We need to find where the dict ends and data begins
 
-        decoded, end_pos = bencode_decode(payload)
+        # The header is tiny, so only its leading bytes are copied for decoding;
+        # fall back to the whole payload if it does not fit
+        try:
+            decoded, end_pos = bencode_decode(bytes(payload[:_METADATA_HEADER_LIMIT]))
+        except ValueError:
+            decoded, end_pos = bencode_decode(bytes(payload))
 
         if not isinstance(decoded, dict):
             raise PeerError("Invalid metadata response format")
@@ -445,8 +672,8 @@ class Peer:
         piece_index = decoded.get("piece", -1)
 
         if msg_type == ExtendedMessageType.DATA:
-            # Data follows the bencoded dictionary
-            data = payload[end_pos:]
+            # Data follows the bencoded dictionary; hand out a view rather than a copy
+            data = memoryview(payload)[end_pos:]
             return (msg_type, piece_index, data)
         elif msg_type == ExtendedMessageType.REJECT:
             return (msg_type, piece_index, None)
@@ -464,20 +691,18 @@ class Peer:
             True if connection successful and peer supports ut_metadata
         """
         try:
-            self.reader, self.writer = await asyncio.wait_for(
-                asyncio.open_connection(self.ip, self.port), timeout=timeout
-            )
+            connection = await asyncio.wait_for(open_peer_connection(self.ip, self.port), timeout=timeout)
+            self.reader = self.writer = connection
 
-            # Perform handshake with extension support
-            await self._handshake(support_extensions=True)
+            # Perform handshake with extension support, sending our extension
+            # handshake in the same write. If the peer turns out not to support
+            # extensions we give up on it anyway, so sending it early is harmless.
+            await self._handshake(support_extensions=True, trailer=_EXTENSION_HANDSHAKE_MESSAGE)
             self.connected = True
 
             if not self.supports_extensions:
                 return False
 
-            # Send our extension handshake
-            await self.send_extension_handshake()
-
             # Wait for their extension handshake
             try:
                 msg_type, payload = await asyncio.wait_for(self.receive_message(), timeout=10.0)
@@ -519,58 +744,65 @@ class Peer:
         piece_size = 16384
         num_pieces = (self.metadata_size + piece_size - 1) // piece_size
 
-        metadata_pieces: dict[int, bytes] = {}
-
-        for piece_index in range(num_pieces):
-            # Request piece
-            await self.request_metadata_piece(piece_index)
+        # Pieces are written straight into their slot of the final buffer as they arrive
+        metadata = bytearray(self.metadata_size)
+        receive_buffer = bytearray(_METADATA_RECEIVE_BUFFER_SIZE)
+        received_pieces: set[int] = set()
+        next_request = 0
 
-            # Wait for response
-            try:
-                while True:
-                    msg_type, payload = await asyncio.wait_for(self.receive_message(), timeout=30.0)
+        # Hoist everything the loop touches per message out of attribute lookups
+        writer = self.writer
+        receive = self.receive_message_into
+        parse = self.parse_metadata_response
+        ut_metadata_id = self.remote_extensions["ut_metadata"]
+        metadata_size = self.metadata_size
 
-                    if msg_type == MessageType.EXTENDED:
-                        ext_id = payload[0]
-                        ext_payload = payload[1:]
-
-                        # Check if this is a ut_metadata response
-                        if ext_id == self.remote_extensions.get("ut_metadata"):
-                            msg_type_meta, piece_idx, data = self.parse_metadata_response(ext_payload)
-
-                            if msg_type_meta == ExtendedMessageType.DATA and data:
-                                metadata_pieces[piece_idx] = data
-                                break
-                            elif msg_type_meta == ExtendedMessageType.REJECT:
-                                return None
-
-                    elif msg_type == MessageType.CHOKE:
-                        await self.handle_choke()
-                    elif msg_type == MessageType.UNCHOKE:
-                        await self.handle_unchoke()
-                    elif msg_type == MessageType.HAVE:
-                        await self.handle_have(payload)
-                    elif msg_type == MessageType.BITFIELD:
-                        await self.handle_bitfield(payload)
+        try:
+            while len(received_pieces) < num_pieces:
+                # Keep up to _METADATA_REQUEST_WINDOW requests in flight instead of
+                # waiting a round trip per piece
+                window_end = min(num_pieces, len(received_pieces) + _METADATA_REQUEST_WINDOW)
+                if next_request < window_end:
+                    writer.writelines(
+                        [_metadata_request_message(ut_metadata_id, index) for index in range(next_request, window_end)]
+                    )
+                    next_request = window_end
+                    await writer.drain()
+
+                # Each payload is consumed before the next receive, so one buffer serves every message
+                msg_type, payload = await receive(receive_buffer, timeout=30.0)
 
-            except TimeoutError:
-                return None
-            except Exception:
-                return None
+                if msg_type == MessageType.EXTENDED:
+                    # Check if this is a ut_metadata response
+                    if payload[0] == ut_metadata_id:
+                        msg_type_meta, piece_idx, data = parse(payload[1:])
+
+                        if msg_type_meta == ExtendedMessageType.DATA and data:
+                            if 0 <= piece_idx < num_pieces:
+                                # Truncate to actual size (last piece may be padded)
+                                start = piece_idx * piece_size
+                                end = min(start + len(data), metadata_size)
+                                metadata[start:end] = data[: end - start]
+                                received_pieces.add(piece_idx)
+                        elif msg_type_meta == ExtendedMessageType.REJECT:
+                            return None
+
+                elif msg_type == MessageType.CHOKE:
+                    await self.handle_choke()
+                elif msg_type == MessageType.UNCHOKE:
+                    await self.handle_unchoke()
+                elif msg_type == MessageType.HAVE:
+                    await self.handle_have(payload)
+                elif msg_type == MessageType.BITFIELD:
+                    await self.handle_bitfield(payload)
 
-        # Assemble metadata
-        if len(metadata_pieces) != num_pieces:
+        except TimeoutError:
+            return None
+        except Exception:
             return None
-
-        metadata = b""
-        for i in range(num_pieces):
-            metadata += metadata_pieces[i]
-
-        # Truncate to actual size (last piece may be padded)
-        metadata = metadata[: self.metadata_size]
 
         # Verify hash
         if hashlib.sha1(metadata).digest() != self.info_hash:
             return None
 
-        return metadata
+        return bytes(metadata)
@@ -0,0 +1,235 @@
+"""
+Buffered asyncio protocol for peer connections.
+
+Incoming data is received directly into a reusable bytearray, bypassing the
+StreamReader buffer, and each readexactly() call copies its bytes out exactly
+once; readinto() copies them straight into a caller-supplied buffer instead.
+The protocol also provides the small StreamWriter subset used by Peer (write,
+writelines, drain, close, wait_closed), so one object serves as both the
+reader and the writer of a connection.
+"""
+
+import asyncio
+import socket
+
+# Initial receive buffer size (fits several 16 KiB PIECE messages)
+_INITIAL_BUFFER_SIZE = 256 * 1024
+# Free space guaranteed to the transport on every receive
+_MIN_RECEIVE_SPACE = 64 * 1024
+# Pause the transport when this many unread bytes are buffered, resume below the low mark
+_HIGH_WATER = 4 * 1024 * 1024
+_LOW_WATER = 1024 * 1024
+# Kernel receive buffer requested for each connection (room for a deep PIECE pipeline)
+_SOCKET_RECEIVE_BUFFER = 1024 * 1024
+
+
+class PeerProtocol(asyncio.BufferedProtocol):
+    """Reader/writer for a single peer connection."""
+
+    def __init__(self) -> None:
+        """Initialize the protocol (called by loop.create_connection)."""
+        self._loop = asyncio.get_running_loop()
+        self._transport: asyncio.Transport | None = None
+        self._buffer = bytearray(_INITIAL_BUFFER_SIZE)
+        self._start = 0  # First unread byte
+        self._end = 0  # One past the last received byte
+        self._eof = False
+        self._exception: Exception | None = None
+        self._data_waiter: asyncio.Future[None] | None = None
+        self._reading_paused = False
+        self._drain_waiter: asyncio.Future[None] | None = None
+        self._writing_paused = False
+        self._closed: asyncio.Future[None] = self._loop.create_future()
+
+    # asyncio protocol callbacks
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Store the transport once the connection is established."""
+        self._transport = transport  # type: ignore[assignment]
+
+        # asyncio already enables TCP_NODELAY on TCP connections; only the receive buffer needs raising
+        sock = transport.get_extra_info("socket")
+        if sock is not None:
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _SOCKET_RECEIVE_BUFFER)
+            except OSError:
+                pass
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        """
+        Return the free tail of the receive buffer for the transport to fill.
+
+        Unread bytes are moved to the front when the tail gets short, and the
+        buffer only grows if that still leaves too little room.
+        """
+        wanted = max(sizehint, _MIN_RECEIVE_SPACE)
+        if len(self._buffer) - self._end < wanted:
+            unread = self._end - self._start
+            if unread + wanted > len(self._buffer):
+                buffer = bytearray(max(unread + wanted, 2 * len(self._buffer)))
+                buffer[:unread] = memoryview(self._buffer)[self._start : self._end]
+                self._buffer = buffer
+            else:
+                self._buffer[:unread] = self._buffer[self._start : self._end]
+            self._start = 0
+            self._end = unread
+        return memoryview(self._buffer)[self._end :]
+
+    def buffer_updated(self, nbytes: int) -> None:
+        """Account for nbytes received into the buffer and wake a waiting reader."""
+        self._end += nbytes
+        self._wake_reader()
+        if not self._reading_paused and self._end - self._start > _HIGH_WATER:
+            self._reading_paused = True
+            self._transport.pause_reading()
+
+    def eof_received(self) -> bool:
+        """Handle the remote end closing its side of the connection."""
+        self._eof = True
+        self._wake_reader()
+        return False
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Wake any waiting reader or writer once the connection is gone."""
+        self._eof = True
+        if exc is not None:
+            self._exception = exc
+        self._wake_reader()
+
+        waiter = self._drain_waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_exception(exc or ConnectionResetError("Connection lost"))
+        if not self._closed.done():
+            self._closed.set_result(None)
+
+    def pause_writing(self) -> None:
+        """Called by the transport when its write buffer is above the high-water mark."""
+        self._writing_paused = True
+
+    def resume_writing(self) -> None:
+        """Called by the transport when its write buffer has drained."""
+        self._writing_paused = False
+        waiter = self._drain_waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    # Reader API
+
+    async def readexactly(self, n: int) -> bytes:
+        """
+        Read exactly n bytes.
+
+        Args:
+            n: Number of bytes to read
+
+        Returns:
+            The bytes read
+
+        Raises:
+            asyncio.IncompleteReadError: If the connection ends before n bytes arrive
+        """
+        await self._wait_for(n)
+        data = bytes(memoryview(self._buffer)[self._start : self._start + n])
+        self._consume(n)
+        return data
+
+    async def readinto(self, view: memoryview) -> None:
+        """
+        Fill view with exactly len(view) bytes, copying straight from the receive buffer.
+
+        Args:
+            view: Writable buffer to fill
+
+        Raises:
+            asyncio.IncompleteReadError: If the connection ends before the view is filled
+        """
+        n = len(view)
+        await self._wait_for(n)
+        view[:] = memoryview(self._buffer)[self._start : self._start + n]
+        self._consume(n)
+
+    async def _wait_for(self, n: int) -> None:
+        """Wait until at least n unread bytes are buffered."""
+        while self._end - self._start < n:
+            if self._exception is not None:
+                raise self._exception
+            if self._eof:
+                partial = bytes(memoryview(self._buffer)[self._start : self._end])
+                self._start = self._end = 0
+                raise asyncio.IncompleteReadError(partial, n)
+            if self._reading_paused:
+                # A read larger than the high-water mark can only complete if more data comes in
+                self._reading_paused = False
+                self._transport.resume_reading()
+            self._data_waiter = self._loop.create_future()
+            try:
+                await self._data_waiter
+            finally:
+                self._data_waiter = None
+
+    def _consume(self, n: int) -> None:
+        """Mark n buffered bytes as read, resuming the transport if it was paused."""
+        self._start += n
+        if self._start == self._end:
+            self._start = self._end = 0
+        if self._reading_paused and self._end - self._start <= _LOW_WATER:
+            self._reading_paused = False
+            self._transport.resume_reading()
+
+    def _wake_reader(self) -> None:
+        """Resolve the pending readexactly() wait, if any."""
+        waiter = self._data_waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    # Writer API
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        """Queue data for sending."""
+        self._transport.write(data)
+
+    def writelines(self, data: list | tuple) -> None:
+        """Queue several buffers for sending without joining them first."""
+        self._transport.writelines(data)
+
+    async def drain(self) -> None:
+        """Wait until the transport's write buffer is below its high-water mark."""
+        if self._transport.is_closing():
+            # Let connection_lost run so a dead connection is reported below
+            await asyncio.sleep(0)
+        if self._exception is not None:
+            raise ConnectionResetError("Connection lost") from self._exception
+        if self._closed.done():
+            raise ConnectionResetError("Connection lost")
+        if not self._writing_paused:
+            return
+        self._drain_waiter = self._loop.create_future()
+        try:
+            await self._drain_waiter
+        finally:
+            self._drain_waiter = None
+
+    def close(self) -> None:
+        """Close the connection."""
+        if self._transport is not None:
+            self._transport.close()
+
+    async def wait_closed(self) -> None:
+        """Wait until the connection has been fully closed."""
+        await self._closed
+
+
+async def open_peer_connection(host: str, port: int) -> PeerProtocol:
+    """
+    Open a TCP connection to a peer.
+
+    Args:
+        host: Peer IP address or hostname
+        port: Peer port
+
+    Returns:
+        Connected protocol, usable as both reader and writer
+    """
+    loop = asyncio.get_running_loop()
+    _, protocol = await loop.create_connection(PeerProtocol, host, port)
+    return protocol
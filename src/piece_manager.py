@@ -3,9 +3,30 @@ Piece manager for downloading and verifying torrent pieces.
 """
 
 import asyncio
-import hashlib
-from dataclasses import dataclass
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from enum import Enum
+from hashlib import sha1
+
+from bitfield import bitfield_size, clear_bit, difference, intersection, set_bit, set_bit_indices
+
+# Size of the blocks pieces are requested in (a power of two, so offsets map to block numbers by shifting)
+_BLOCK_SHIFT = 14
+BLOCK_SIZE = 1 << _BLOCK_SHIFT  # 16 KiB
+
+# hashlib releases the GIL while hashing large buffers, so pieces hashed on
+# these threads are verified in parallel and off the event loop
+_HASH_WORKERS = min(4, os.cpu_count() or 1)
+_hash_executor: ThreadPoolExecutor | None = None
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    """Return the shared piece hashing executor, creating it on first use."""
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ThreadPoolExecutor(max_workers=_HASH_WORKERS, thread_name_prefix="piece-hash")
+    return _hash_executor
 
 
 class PieceStatus(Enum):
@@ -18,7 +39,7 @@ class PieceStatus(Enum):
     FAILED = "failed"
 
 
-@dataclass
+@dataclass(slots=True)
 class Block:
     """Represents a block within a piece."""
 
@@ -29,37 +50,51 @@ class Block:
     requested: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class Piece:
-    """Represents a torrent piece."""
+    """
+    Represents a torrent piece.
+
+    Block state is kept as two flag arrays indexed by block number rather than
+    one Block object per 16 KiB block, and received blocks are written straight
+    into a single piece buffer that is only allocated once the first block arrives.
+    """
 
     index: int
     length: int
     hash: bytes
     status: PieceStatus = PieceStatus.MISSING
-    blocks: list[Block] = None
-    blocks_by_offset: dict[int, Block] = None
-    data: bytes | None = None
+    data: bytes | bytearray | None = None
+    buffer: bytearray | None = None
+    requested: bytearray = field(init=False, repr=False)  # 1 per block with an outstanding request
+    received: bytearray = field(init=False, repr=False)  # 1 per block whose data is in buffer
 
     def __post_init__(self) -> None:
-        """Initialize blocks after creation."""
-        if self.blocks is None:
-            self.blocks = []
-        if self.blocks_by_offset is None:
-            self.blocks_by_offset = {}
-            # Create blocks (typically 16KB each)
-            block_size = 16 * 1024  # 16KB
-            offset = 0
-            while offset < self.length:
-                block_length = min(block_size, self.length - offset)
-                block = Block(piece_index=self.index, offset=offset, length=block_length)
-                self.blocks.append(block)
-                self.blocks_by_offset[offset] = block
-                offset += block_length
+        """Initialize block state after creation."""
+        block_count = (self.length + BLOCK_SIZE - 1) // BLOCK_SIZE
+        self.requested = bytearray(block_count)
+        self.received = bytearray(block_count)
+
+    def block_index(self, offset: int) -> int | None:
+        """Get the block number for a block offset, or None if no block starts there."""
+        block_index = offset >> _BLOCK_SHIFT
+        if offset & (BLOCK_SIZE - 1) or not 0 <= block_index < len(self.received):
+            return None
+        return block_index
+
+    def block_length(self, block_index: int) -> int:
+        """Get the length of a block (the last block may be short)."""
+        return min(BLOCK_SIZE, self.length - block_index * BLOCK_SIZE)
 
 
 class PieceManager:
-    """Manages downloading and verifying torrent pieces."""
+    """
+    Manages downloading and verifying torrent pieces.
+
+    Block bookkeeping methods are synchronous and take no locks: the event loop
+    runs them without interleaving, and each piece is downloaded by a single
+    task at a time (enforced by mark_piece_downloading under piece_lock).
+    """
 
     def __init__(self, pieces: list[tuple[int, int, bytes]], total_pieces: int) -> None:
         """
@@ -73,53 +108,59 @@ class PieceManager:
         self.total_pieces = total_pieces
         self.completed_pieces: set[int] = set()
         self.downloading_pieces: set[int] = set()
+        # Bitfield of pieces still needed (cleared as pieces complete)
+        self.wanted_pieces = bytearray(bitfield_size(total_pieces))
+        # Bitfield mirror of downloading_pieces, for whole-bitfield candidate selection
+        self.downloading_bitfield = bytearray(bitfield_size(total_pieces))
         self.piece_lock = asyncio.Lock()
-        self.block_locks: dict[int, asyncio.Lock] = {}  # piece_index -> Lock
 
         # Create piece objects
         for index, length, piece_hash in pieces:
             self.pieces[index] = Piece(index=index, length=length, hash=piece_hash)
-            self.block_locks[index] = asyncio.Lock()
+            set_bit(self.wanted_pieces, index)
 
     def get_piece(self, index: int) -> Piece | None:
         """Get a piece by index."""
         return self.pieces.get(index)
 
     def get_next_piece_to_download(
-        self, peer_has_pieces: set[int], availability: list[int] | None = None
+        self, peer_bitfield: bytes | bytearray, availability: list[int] | None = None
     ) -> Piece | None:
         """
         Get the next piece to download based on peer availability.
 
         Args:
-            peer_has_pieces: Set of piece indices the peer has
+            peer_bitfield: Bitfield of the pieces the peer has
             availability: Optional list of availability counts by piece index
 
         Returns:
             Next piece to download or None
         """
-        # Find pieces that:
-        # 1. We don't have
-        # 2. Peer has
-        # 3. We're not currently downloading
+        # Pieces we still want that the peer has and nobody is downloading,
+        # found with whole-bitfield AND/AND-NOT and listed in ascending order
+        candidates = set_bit_indices(
+            difference(intersection(self.wanted_pieces, peer_bitfield), self.downloading_bitfield), self.total_pieces
+        )
 
-        available_pieces = peer_has_pieces - self.completed_pieces - self.downloading_pieces
-
-        if not available_pieces:
+        if not candidates:
             return None
 
-        # Prefer pieces with fewer peers (rarest-first strategy)
+        # Prefer pieces with fewer peers (rarest-first strategy). Only the rarest
+        # candidate is needed, so a linear min() replaces sorting all of them;
+        # min() keeps the first of equal counts, so ties go to the lowest index.
         if availability:
-            ordered = sorted(
-                available_pieces, key=lambda idx: (availability[idx] if idx < len(availability) else 0, idx)
-            )
+            if len(availability) >= self.total_pieces:
+                piece_index = min(candidates, key=availability.__getitem__)
+            else:
+                known = len(availability)
+                piece_index = min(candidates, key=lambda idx: availability[idx] if idx < known else 0)
         else:
-            ordered = sorted(available_pieces)
+            piece_index = candidates[0]
 
-        for piece_index in ordered:
-            piece = self.pieces.get(piece_index)
-            if piece and piece.status == PieceStatus.MISSING:
-                return piece
+        # Wanted and not downloading implies MISSING; checked anyway in case of a stale caller
+        piece = self.pieces.get(piece_index)
+        if piece and piece.status == PieceStatus.MISSING:
+            return piece
 
         return None
 
@@ -143,6 +184,7 @@ class PieceManager:
 
             piece.status = PieceStatus.DOWNLOADING
             self.downloading_pieces.add(piece_index)
+            set_bit(self.downloading_bitfield, piece_index)
             return True
 
     async def mark_piece_complete(self, piece_index: int) -> None:
@@ -158,6 +200,8 @@ class PieceManager:
                 piece.status = PieceStatus.COMPLETE
             self.completed_pieces.add(piece_index)
             self.downloading_pieces.discard(piece_index)
+            clear_bit(self.downloading_bitfield, piece_index)
+            clear_bit(self.wanted_pieces, piece_index)
 
     async def mark_piece_failed(self, piece_index: int) -> None:
         """
@@ -171,9 +215,10 @@ class PieceManager:
             if piece:
                 piece.status = PieceStatus.MISSING
             self.downloading_pieces.discard(piece_index)
-        await self.reset_piece(piece_index)
+            clear_bit(self.downloading_bitfield, piece_index)
+        self.reset_piece(piece_index)
 
-    async def reset_piece(self, piece_index: int) -> None:
+    def reset_piece(self, piece_index: int) -> None:
         """
         Reset a piece's blocks so it can be re-downloaded.
 
@@ -184,16 +229,11 @@ class PieceManager:
         if not piece:
             return
 
-        lock = self.block_locks.get(piece_index)
-        if not lock:
-            return
-
-        async with lock:
-            for block in piece.blocks:
-                block.data = None
-                block.requested = False
+        piece.buffer = None
+        piece.requested[:] = bytes(len(piece.requested))
+        piece.received[:] = bytes(len(piece.received))
 
-    async def add_block_data(self, piece_index: int, block_offset: int, block_data: bytes) -> None:
+    def add_block_data(self, piece_index: int, block_offset: int, block_data: bytes) -> None:
         """
         Add block data to a piece.
 
@@ -206,16 +246,16 @@ class PieceManager:
         if not piece:
             return
 
-        lock = self.block_locks.get(piece_index)
-        if not lock:
+        block_index = piece.block_index(block_offset)
+        if block_index is None or len(block_data) != piece.block_length(block_index):
             return
 
-        async with lock:
-            block = piece.blocks_by_offset.get(block_offset)
-            if block:
-                block.data = block_data
+        if piece.buffer is None:
+            piece.buffer = bytearray(piece.length)
+        piece.buffer[block_offset : block_offset + len(block_data)] = block_data
+        piece.received[block_index] = 1
 
-    async def is_piece_complete(self, piece_index: int) -> bool:
+    def is_piece_complete(self, piece_index: int) -> bool:
         """
         Check if all blocks of a piece are downloaded.
 
@@ -229,14 +269,9 @@ class PieceManager:
         if not piece:
             return False
 
-        lock = self.block_locks.get(piece_index)
-        if not lock:
-            return False
+        return 0 not in piece.received
 
-        async with lock:
-            return all(block.data is not None for block in piece.blocks)
-
-    async def assemble_piece(self, piece_index: int) -> bytes | None:
+    def assemble_piece(self, piece_index: int) -> bytearray | None:
         """
         Assemble piece data from blocks.
 
@@ -250,11 +285,13 @@ class PieceManager:
         if not piece:
             return None
 
-        if not await self.is_piece_complete(piece_index):
+        if not self.is_piece_complete(piece_index):
             return None
 
-        # Assemble blocks in order (blocks already built in order)
-        piece_data = b"".join(block.data for block in piece.blocks if block.data)
+        # Blocks were written into place as they arrived, so the buffer is the piece;
+        # hand it over rather than copying it
+        piece_data = piece.buffer
+        piece.buffer = None
 
         # Store in piece
         piece.data = piece_data
@@ -276,10 +313,24 @@ class PieceManager:
             return False
 
         # Calculate SHA-1 hash
-        piece_hash = hashlib.sha1(piece_data).digest()
+        piece_hash = sha1(piece_data).digest()
 
         return piece_hash == piece.hash
 
+    async def verify_piece_async(self, piece_index: int, piece_data: bytes) -> bool:
+        """
+        Verify piece data against its hash on the hashing thread pool.
+
+        Args:
+            piece_index: Index of the piece
+            piece_data: Piece data to verify
+
+        Returns:
+            True if hash matches, False otherwise
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_executor(), self.verify_piece, piece_index, piece_data)
+
     def get_progress(self) -> tuple[int, int, float]:
         """
         Get download progress.
@@ -302,7 +353,7 @@ class PieceManager:
         async with self.piece_lock:
             return sum(self.pieces[index].length for index in self.completed_pieces if index in self.pieces)
 
-    async def get_next_block_to_request(self, piece_index: int) -> Block | None:
+    def get_next_block_to_request(self, piece_index: int) -> Block | None:
         """
         Get the next block to request for a piece.
 
@@ -316,19 +367,19 @@ class PieceManager:
         if not piece:
             return None
 
-        lock = self.block_locks.get(piece_index)
-        if not lock:
-            return None
+        # Find first block that hasn't been requested and doesn't have data
+        requested, received = piece.requested, piece.received
+        block_index = requested.find(0)
+        while block_index != -1 and received[block_index]:
+            block_index = requested.find(0, block_index + 1)
 
-        async with lock:
-            # Find first block that hasn't been requested and doesn't have data
-            for block in piece.blocks:
-                if not block.requested and block.data is None:
-                    return block
-
-        return None
+        if block_index == -1:
+            return None
+        return Block(
+            piece_index=piece_index, offset=block_index << _BLOCK_SHIFT, length=piece.block_length(block_index)
+        )
 
-    async def mark_block_requested(self, piece_index: int, block_offset: int) -> None:
+    def mark_block_requested(self, piece_index: int, block_offset: int) -> None:
         """
         Mark a block as requested.
 
@@ -340,16 +391,13 @@ class PieceManager:
         if not piece:
             return
 
-        lock = self.block_locks.get(piece_index)
-        if not lock:
+        block_index = piece.block_index(block_offset)
+        if block_index is None:
             return
 
-        async with lock:
-            block = piece.blocks_by_offset.get(block_offset)
-            if block:
-                block.requested = True
+        piece.requested[block_index] = 1
 
-    async def mark_block_received(self, piece_index: int, block_offset: int) -> None:
+    def mark_block_received(self, piece_index: int, block_offset: int) -> None:
         """
         Mark a block as received (reset requested flag).
 
@@ -361,11 +409,8 @@ class PieceManager:
         if not piece:
             return
 
-        lock = self.block_locks.get(piece_index)
-        if not lock:
+        block_index = piece.block_index(block_offset)
+        if block_index is None:
             return
 
-        async with lock:
-            block = piece.blocks_by_offset.get(block_offset)
-            if block:
-                block.requested = False
+        piece.requested[block_index] = 0
@@ -6,12 +6,60 @@ Uses Pydantic for structured data validation and type safety.
 from __future__ import annotations
 
 import hashlib
+import struct
+import sys
+from collections.abc import Iterator
 from datetime import datetime
+from functools import cached_property
+from itertools import chain
 from pathlib import Path
 from typing import Any
 
 from pydantic import BaseModel, Field, computed_field, model_validator
 
+from magnet import bencode_decode
+
+try:
+    from fastbencode import bdecode as _fast_bdecode
+    from fastbencode import bencode as _fast_bencode
+except ImportError:  # fastbencode is an optional speedup; fall back to the pure-Python decoder
+    _fast_bdecode = None
+    _fast_bencode = None
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+_SIZE_DIVISORS = tuple(1 << (10 * i) for i in range(len(_SIZE_UNITS)))
+
+# Largest .torrent file parse() accepts by default (real ones are at most a few MiB)
+_MAX_TORRENT_SIZE = 64 * 1024 * 1024
+
+# One SHA-1 piece hash from the info dict's pieces blob
+_PIECE_HASH = struct.Struct("20s")
+
+# Interned str for the dictionary keys found in (nearly) every torrent
+_COMMON_KEYS = {
+    key.encode(): sys.intern(key)
+    for key in (
+        "announce",
+        "announce-list",
+        "comment",
+        "created by",
+        "creation date",
+        "encoding",
+        "files",
+        "info",
+        "length",
+        "name",
+        "path",
+        "piece length",
+        "pieces",
+        "private",
+    )
+}
+
+
+# Top-level text fields that bencode stores as byte strings
+_TEXT_FIELDS = ("announce", "comment", "created by", "encoding")
+
 
 class BencodeError(Exception):
     """Exception raised for bencode parsing errors."""
@@ -66,7 +114,7 @@ class TorrentInfo(BaseModel):
 
                 path = file_info.get("path", [])
                 if isinstance(path, list):
-                    path = [p.decode("utf-8", errors="replace") if isinstance(p, bytes) else str(p) for p in path]
+                    path = [p.decode("utf-8", errors="replace") if type(p) is bytes else str(p) for p in path]
                 decoded_files.append({"length": file_info.get("length", 0), "path": path})
             data["files"] = decoded_files
 
@@ -79,34 +127,44 @@ class TorrentInfo(BaseModel):
         return len(self.pieces) // 20
 
     @computed_field
-    @property
+    @cached_property
     def total_size(self) -> int:
-        """Get the total size of all files."""
+        """Get the total size of all files (summed once; trackers and status polling ask repeatedly)."""
         if self.length is not None:
             return self.length
         if self.files:
             return sum(f.length for f in self.files)
         return 0
 
+    @cached_property
+    def piece_hashes(self) -> list[bytes]:
+        """Get the SHA-1 hash of every piece, split out of the pieces blob once (in C, not a slice per piece)."""
+        view = memoryview(self.pieces)[: self.piece_count * 20]
+        return [piece_hash for (piece_hash,) in _PIECE_HASH.iter_unpack(view)]
+
     @computed_field
     @property
     def is_single_file(self) -> bool:
         """Check if this is a single-file torrent."""
         return self.length is not None
 
-    def get_files(self) -> list[TorrentFile]:
-        """Get the list of files in the torrent."""
+    @cached_property
+    def file_list(self) -> tuple[TorrentFile, ...]:
+        """Get the files in the torrent (built once, as a tuple so the cached value cannot be modified)."""
         if self.files:
-            return self.files
+            return tuple(self.files)
         # Single file torrent
-        return [TorrentFile(length=self.length or 0, path=[self.name])]
+        return (TorrentFile(length=self.length or 0, path=[self.name]),)
+
+    def get_files(self) -> list[TorrentFile]:
+        """Get the list of files in the torrent."""
+        return list(self.file_list)
 
     def get_piece_hash(self, piece_index: int) -> bytes:
         """Get the SHA-1 hash for a specific piece."""
         if piece_index < 0 or piece_index >= self.piece_count:
             raise IndexError(f"Piece index {piece_index} out of range (0-{self.piece_count - 1})")
-        start = piece_index * 20
-        return self.pieces[start : start + 20]
+        return self.piece_hashes[piece_index]
 
 
 class Torrent(BaseModel):
@@ -131,31 +189,18 @@ class Torrent(BaseModel):
     @classmethod
     def decode_bytes_fields(cls, data: dict[str, Any]) -> dict[str, Any]:
         """Decode bytes fields to strings where appropriate."""
-        if isinstance(data.get("announce"), bytes):
-            data["announce"] = data["announce"].decode("utf-8", errors="replace")
-
-        if isinstance(data.get("comment"), bytes):
-            data["comment"] = data["comment"].decode("utf-8", errors="replace")
-
-        if isinstance(data.get("created by"), bytes):
-            data["created by"] = data["created by"].decode("utf-8", errors="replace")
-
-        if isinstance(data.get("encoding"), bytes):
-            data["encoding"] = data["encoding"].decode("utf-8", errors="replace")
+        for key in _TEXT_FIELDS:
+            value = data.get(key)
+            if type(value) is bytes:
+                data[key] = value.decode("utf-8", errors="replace")
 
         # Handle announce-list (list of lists of bytes)
         if "announce-list" in data and data["announce-list"]:
-            decoded_list = []
-            for tier in data["announce-list"]:
-                if isinstance(tier, list):
-                    decoded_tier = []
-                    for url in tier:
-                        if isinstance(url, bytes):
-                            decoded_tier.append(url.decode("utf-8", errors="replace"))
-                        else:
-                            decoded_tier.append(str(url))
-                    decoded_list.append(decoded_tier)
-            data["announce-list"] = decoded_list
+            data["announce-list"] = [
+                [url.decode("utf-8", errors="replace") if type(url) is bytes else str(url) for url in tier]
+                for tier in data["announce-list"]
+                if isinstance(tier, list)
+            ]
 
         return data
 
@@ -191,20 +236,24 @@ class Torrent(BaseModel):
             return datetime.fromtimestamp(self.creation_date)
         return None
 
-    def get_announce_urls(self) -> list[str]:
-        """Get all unique announce URLs."""
-        urls: list[str] = []
+    @cached_property
+    def announce_urls(self) -> tuple[str, ...]:
+        """Get all unique announce URLs (built once, as a tuple so the cached value cannot be modified)."""
+        # dict keys dedupe in constant time per URL while keeping first-seen order
+        urls: dict[str, None] = {}
 
         if self.announce:
-            urls.append(self.announce)
+            urls[self.announce] = None
 
         if self.announce_list:
             for tier in self.announce_list:
-                for url in tier:
-                    if url not in urls:
-                        urls.append(url)
+                urls.update(dict.fromkeys(tier))
 
-        return urls
+        return tuple(urls)
+
+    def get_announce_urls(self) -> list[str]:
+        """Get all unique announce URLs."""
+        return list(self.announce_urls)
 
     def get_files(self) -> list[TorrentFile]:
         """Get the list of files."""
@@ -258,12 +307,18 @@ class TorrentParser:
         self._raw_data: bytes = b""
         self._raw_dict: dict[str, Any] | None = None
         self._torrent: Torrent | None = None
-        self._info_hash_override: bytes | None = None
+        # Info hash, computed on first use (or supplied with magnet metadata)
+        self._info_hash: bytes | None = None
+        # Byte range of the bencoded info dictionary within _raw_data
+        self._info_span: tuple[int, int] | None = None
 
-    def parse(self) -> Torrent:
+    def parse(self, max_size: int = _MAX_TORRENT_SIZE) -> Torrent:
         """
         Parse the torrent file and return a Torrent model.
 
+        Args:
+            max_size: Largest file size in bytes to accept
+
         Returns:
             Torrent model containing all parsed data
         """
@@ -271,11 +326,16 @@ class TorrentParser:
             raise BencodeError("No torrent file path specified")
 
         with open(self.torrent_path, "rb") as f:
-            self._raw_data = f.read()
+            # Read one byte past the limit to tell an oversized file from one exactly at it
+            raw_data = f.read(max_size + 1)
+        if len(raw_data) > max_size:
+            raise BencodeError(f"Torrent file is larger than {max_size} bytes")
+        self._raw_data = raw_data
 
-        data, _ = self._decode_bencode(self._raw_data, 0)
-        if not isinstance(data, dict):
-            raise BencodeError("Torrent file must start with a dictionary")
+        # Forget anything derived from a previous parse
+        self._info_hash = None
+        self._info_span = None
+        data = self._decode_torrent_dict(self._raw_data)
 
         self._raw_dict = data
         self._torrent = Torrent.model_validate(data)
@@ -296,16 +356,23 @@ class TorrentParser:
             Torrent model containing parsed data
         """
         # Decode the info dictionary
-        info_dict, _ = self._decode_bencode(metadata, 0)
+        info_dict = _native_decode(metadata)
+        if info_dict is not None:
+            info_end = len(metadata)
+        else:
+            info_dict, info_end = self._decode_bencode(metadata, 0)
         if not isinstance(info_dict, dict):
             raise BencodeError("Metadata must be a dictionary")
+        self._raw_data = metadata
+        self._info_span = (0, info_end)
+        self._info_hash = None
 
         # Verify hash if provided
         if info_hash:
             computed_hash = hashlib.sha1(metadata).digest()
             if computed_hash != info_hash:
                 raise BencodeError("Info hash verification failed")
-            self._info_hash_override = info_hash
+            self._info_hash = info_hash
 
         # Build a complete torrent dict
         torrent_dict: dict[str, Any] = {"info": info_dict}
@@ -327,9 +394,108 @@ class TorrentParser:
             self.parse()
         return self._torrent  # type: ignore
 
+    def _decode_torrent_dict(self, data: bytes) -> dict[str, Any]:
+        """
+        Decode the top-level torrent dictionary, recording where 'info' lies.
+
+        Args:
+            data: The raw torrent file bytes
+
+        Returns:
+            The decoded top-level dictionary
+        """
+        if data[:1] != b"d":
+            # Reject at once rather than decoding a whole non-dictionary value; a first
+            # byte that cannot start any bencoded value still gets the decoder's own error
+            if data[:1] not in (b"l", b"i") and not data[:1].isdigit():
+                self._decode_bencode(data, 0)
+            raise BencodeError("Torrent file must start with a dictionary")
+
+        result = self._decode_torrent_dict_native(data)
+        if result is not None:
+            return result
+
+        index = 1
+        result: dict[str, Any] = {}
+        while index < len(data) and data[index : index + 1] != b"e":
+            key, index = self._decode_bencode(data, index)
+            if isinstance(key, bytes):
+                key = key.decode("utf-8", errors="replace")
+            value_start = index
+            result[key], index = self._decode_bencode(data, index)
+            if key == "info":
+                self._info_span = (value_start, index)
+        if index >= len(data):
+            raise BencodeError(f"Unterminated dictionary at index {index}")
+        return result
+
+    def _decode_torrent_dict_native(self, data: bytes) -> dict[str, Any] | None:
+        """
+        Decode the top-level torrent dictionary with fastbencode, if it is installed.
+
+        fastbencode does not report offsets, so the raw bytes of the info
+        dictionary are located separately (see _locate_info_span).
+
+        Args:
+            data: The raw torrent file bytes
+
+        Returns:
+            The decoded top-level dictionary, or None if the pure-Python decoder
+            must be used instead (fastbencode missing or rejecting the data, or the
+            info dictionary's bytes could not be located)
+        """
+        if _fast_bdecode is None:
+            return None
+        try:
+            decoded = _fast_bdecode(data)
+        except ValueError:
+            return None
+        if type(decoded) is not dict:
+            return None
+
+        if b"info" in decoded:
+            span = self._locate_info_span(data, decoded)
+            if span is None:
+                return None
+            self._info_span = span
+
+        return _keys_to_str(decoded, dict(_COMMON_KEYS))
+
+    def _locate_info_span(self, data: bytes, decoded: dict[bytes, Any]) -> tuple[int, int] | None:
+        """
+        Find the byte range of the info dictionary in a torrent fastbencode accepted.
+
+        fastbencode only accepts strictly sorted, unique keys, so when "info" is
+        the last key its value runs up to the final "e" and only the small values
+        before it need skipping. Otherwise the info dictionary is re-encoded
+        (canonically) and those exact bytes are searched for after an "info" key.
+
+        Args:
+            data: The raw torrent file bytes
+            decoded: fastbencode's decoding of data (bytes keys, in file order)
+
+        Returns:
+            (start, end) of the info value, or None if it could not be located
+        """
+        keys = list(decoded)
+        if keys[-1] == b"info":
+            index = 1
+            for _ in keys[:-1]:
+                _, index = self._decode_bencode(data, index)
+                _, index = self._decode_bencode(data, index)
+            if data[index : index + 6] == b"4:info":
+                return (index + 6, len(data) - 1)
+            return None
+
+        info_bytes = _fast_bencode(decoded[b"info"])
+        start = data.find(info_bytes)
+        if start < 6 or data[start - 6 : start] != b"4:info":
+            return None
+        return (start, start + len(info_bytes))
+
     def _decode_bencode(self, data: bytes, index: int) -> tuple[Any, int]:
         """
-        Decode bencoded data recursively.
+        Decode one bencoded value.
 
         Args:
             data: The raw bytes to decode
@@ -338,68 +504,10 @@ class TorrentParser:
         Returns:
             Tuple of (decoded_value, new_index)
         """
-        if index >= len(data):
-            raise BencodeError(f"Unexpected end of data at index {index}")
-
-        char = data[index : index + 1]
-
-        # Integer: i<number>e
-        if char == b"i":
-            end_index = data.find(b"e", index + 1)
-            if end_index == -1:
-                raise BencodeError(f"Unterminated integer at index {index}")
-            try:
-                value = int(data[index + 1 : end_index])
-                return value, end_index + 1
-            except ValueError as e:
-                raise BencodeError(f"Invalid integer at index {index}") from e
-
-        # List: l<elements>e
-        elif char == b"l":
-            index += 1
-            result: list[Any] = []
-            while index < len(data) and data[index : index + 1] != b"e":
-                value, index = self._decode_bencode(data, index)
-                result.append(value)
-            if index >= len(data):
-                raise BencodeError(f"Unterminated list at index {index}")
-            return result, index + 1
-
-        # Dictionary: d<key-value pairs>e
-        elif char == b"d":
-            index += 1
-            result_dict: dict[Any, Any] = {}
-            while index < len(data) and data[index : index + 1] != b"e":
-                key, index = self._decode_bencode(data, index)
-                value, index = self._decode_bencode(data, index)
-                # Convert dictionary keys from bytes to strings (bencode spec)
-                if isinstance(key, bytes):
-                    key = key.decode("utf-8", errors="replace")
-                result_dict[key] = value
-            if index >= len(data):
-                raise BencodeError(f"Unterminated dictionary at index {index}")
-            return result_dict, index + 1
-
-        # String: <length>:<data>
-        elif char.isdigit():
-            colon_index = data.find(b":", index)
-            if colon_index == -1:
-                raise BencodeError(f"No colon found for string at index {index}")
-            try:
-                length = int(data[index:colon_index])
-            except ValueError as e:
-                raise BencodeError(f"Invalid string length at index {index}") from e
-
-            start_index = colon_index + 1
-            end_index = start_index + length
-            if end_index > len(data):
-                raise BencodeError(f"String length exceeds data at index {index}")
-
-            value = data[start_index:end_index]
-            return value, end_index
-
-        else:
-            raise BencodeError(f"Unexpected character '{char.decode('latin-1', errors='replace')}' at index {index}")
+        try:
+            return bencode_decode(data, index, dict(_COMMON_KEYS))
+        except ValueError as e:
+            raise BencodeError(str(e)) from e
 
     def _encode_bencode(self, value: Any) -> bytes:
         """
@@ -411,29 +519,56 @@ class TorrentParser:
         Returns:
             Bencoded bytes
         """
-        if isinstance(value, int):
-            return f"i{value}e".encode()
-        elif isinstance(value, bytes):
-            return f"{len(value)}:".encode() + value
-        elif isinstance(value, str):
-            value_bytes = value.encode("utf-8")
-            return f"{len(value_bytes)}:".encode() + value_bytes
-        elif isinstance(value, list):
-            result = b"l"
-            for item in value:
-                result += self._encode_bencode(item)
-            result += b"e"
-            return result
-        elif isinstance(value, dict):
-            result = b"d"
-            # Bencode requires keys to be sorted
-            for key in sorted(value.keys()):
-                result += self._encode_bencode(key)
-                result += self._encode_bencode(value[key])
-            result += b"e"
-            return result
-        else:
-            raise BencodeError(f"Cannot encode type: {type(value)}")
+        buffer = bytearray()
+        self._encode_into(value, buffer)
+        return bytes(buffer)
+
+    def _encode_into(self, value: Any, buffer: bytearray) -> None:
+        """
+        Append the bencoding of a Python value to buffer.
+
+        Nested lists and dictionaries are walked with an explicit stack of
+        iterators, so deep nesting cannot hit the recursion limit.
+
+        Args:
+            value: The value to encode
+            buffer: Output buffer shared by the whole encode
+        """
+        # Iterator over the innermost open container (the top level is a one-item container
+        # without delimiters), and those of its enclosing containers
+        items: Iterator[Any] = iter((value,))
+        stack: list[Iterator[Any]] = []
+
+        while True:
+            for value in items:
+                if isinstance(value, int):
+                    buffer += b"i%de" % value
+                elif isinstance(value, bytes):
+                    buffer += b"%d:" % len(value)
+                    buffer += value
+                elif isinstance(value, str):
+                    value_bytes = value.encode("utf-8")
+                    buffer += b"%d:" % len(value_bytes)
+                    buffer += value_bytes
+                elif isinstance(value, list):
+                    buffer += b"l"
+                    stack.append(items)
+                    items = iter(value)
+                    break
+                elif isinstance(value, dict):
+                    buffer += b"d"
+                    stack.append(items)
+                    # Bencode requires sorted keys; keys are unique, so sorting the items never compares values
+                    items = chain.from_iterable(sorted(value.items()))
+                    break
+                else:
+                    raise BencodeError(f"Cannot encode type: {type(value)}")
+            else:
+                # The innermost container has run out: close it and resume its parent
+                if not stack:
+                    return
+                buffer += b"e"
+                items = stack.pop()
 
     def get_info_hash(self) -> str:
         """
@@ -442,18 +577,7 @@ class TorrentParser:
         Returns:
             Hexadecimal string of the info hash
         """
-        if self._info_hash_override:
-            return self._info_hash_override.hex()
-
-        if self._raw_dict is None:
-            self.parse()
-
-        if "info" not in self._raw_dict:  # type: ignore
-            raise ValueError("Torrent file missing 'info' dictionary")
-
-        # Re-encode the info dictionary to calculate its hash
-        info_bytes = self._encode_bencode(self._raw_dict["info"])  # type: ignore
-        return hashlib.sha1(info_bytes).hexdigest()
+        return self.get_info_hash_bytes().hex()
 
     def get_info_hash_bytes(self) -> bytes:
         """
@@ -462,8 +586,8 @@ class TorrentParser:
         Returns:
             Raw bytes of the info hash (20 bytes)
         """
-        if self._info_hash_override:
-            return self._info_hash_override
+        if self._info_hash is not None:
+            return self._info_hash
 
         if self._raw_dict is None:
             self.parse()
@@ -471,8 +595,14 @@ class TorrentParser:
         if "info" not in self._raw_dict:  # type: ignore
             raise ValueError("Torrent file missing 'info' dictionary")
 
-        info_bytes = self._encode_bencode(self._raw_dict["info"])  # type: ignore
-        return hashlib.sha1(info_bytes).digest()
+        # Hash the info dictionary exactly as it appears in the file
+        if self._info_span is not None:
+            start, end = self._info_span
+            self._info_hash = hashlib.sha1(memoryview(self._raw_data)[start:end]).digest()
+        else:
+            info_bytes = self._encode_bencode(self._raw_dict["info"])  # type: ignore
+            self._info_hash = hashlib.sha1(info_bytes).digest()
+        return self._info_hash
 
     # Convenience methods that delegate to the Torrent model
     def get_announce_urls(self) -> list[str]:
@@ -517,6 +647,51 @@ class TorrentParser:
         self.torrent.print_summary()
 
 
+def _native_decode(data: bytes) -> Any | None:
+    """
+    Decode a complete bencoded value with fastbencode, converting dict keys to str.
+
+    Args:
+        data: Bencoded data (nothing may follow the value)
+
+    Returns:
+        The decoded value, or None if fastbencode is not installed or rejects the data
+    """
+    if _fast_bdecode is None:
+        return None
+    try:
+        return _keys_to_str(_fast_bdecode(data), dict(_COMMON_KEYS))
+    except ValueError:
+        return None
+
+
+def _keys_to_str(value: Any, key_strings: dict[bytes, str]) -> Any:
+    """
+    Convert the bytes dict keys of a fastbencode result to str, as _decode_bencode does.
+
+    Args:
+        value: Decoded value
+        key_strings: Cache of already decoded keys, so repeated keys share one str
+
+    Returns:
+        The value with every dictionary key decoded
+    """
+    value_type = type(value)
+    if value_type is dict:
+        result = {}
+        for key, item in value.items():
+            if type(key) is bytes:
+                text = key_strings.get(key)
+                if text is None:
+                    text = key_strings[key] = key.decode("utf-8", errors="replace")
+                key = text
+            result[key] = _keys_to_str(item, key_strings)
+        return result
+    if value_type is list:
+        return [_keys_to_str(item, key_strings) for item in value]
+    return value
+
+
 def _format_size(size_bytes: int) -> str:
     """
     Format bytes into human-readable size.
@@ -527,12 +702,9 @@ def _format_size(size_bytes: int) -> str:
     Returns:
         Formatted size string
     """
-    size = float(size_bytes)
-    for unit in ["B", "KB", "MB", "GB", "TB"]:
-        if size < 1024.0:
-            return f"{size:.2f} {unit}"
-        size /= 1024.0
-    return f"{size:.2f} PB"
+    # Each unit is 2**10 times the previous one, so the unit index falls out of the bit length
+    unit_index = min((max(size_bytes, 1).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / _SIZE_DIVISORS[unit_index]:.2f} {_SIZE_UNITS[unit_index]}"
 
 
 def main() -> None:
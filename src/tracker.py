@@ -4,13 +4,44 @@ Handles HTTP/HTTPS and UDP tracker communication.
 """
 
 import asyncio
+import os
 import random
 import socket
 import struct
+import time
 import urllib.parse
+import weakref
+from functools import lru_cache
+from typing import ClassVar
 
 import aiohttp
 
+from magnet import bencode_decode
+
+# UDP tracker protocol (BEP 15) packets
+_UDP_PROTOCOL_ID = 0x41727101980
+_CONNECT_REQUEST = struct.Struct(">QII")  # protocol_id, action, transaction_id
+_CONNECT_RESPONSE = struct.Struct(">IIQ")  # action, transaction_id, connection_id
+_ANNOUNCE_REQUEST = struct.Struct(">QII20s20sQQQIIIiH")
+_ANNOUNCE_RESPONSE = struct.Struct(">IIIII")  # action, transaction_id, interval, leechers, seeders
+# Transaction ID field of a UDP tracker reply (after the 4-byte action)
+_TRANSACTION_ID = struct.Struct(">I")
+_UDP_EVENTS = {"started": 2, "stopped": 3, "completed": 1}
+# Wait after each send of a UDP request before resending (BEP 15 backoff, shortened so a dead
+# tracker does not hold up peer discovery for minutes)
+_UDP_TIMEOUTS = (5.0, 10.0)
+# How long a connection ID may be reused (BEP 15: one minute after it was received)
+_CONNECTION_ID_LIFETIME = 60.0
+# Kernel receive buffer requested for the shared UDP socket, so a burst of replies from many
+# trackers is not dropped while the event loop is busy (Linux caps it at net.core.rmem_max)
+_UDP_RECEIVE_BUFFER = 1024 * 1024
+# Compact peer entry: 4-byte IPv4 address and 2-byte port
+_COMPACT_PEER = struct.Struct(">4sH")
+# Connection pool settings for the shared HTTP tracker session
+_HTTP_CONNECTION_LIMIT = 64
+# Seconds to reuse a resolved tracker address (HTTP and UDP)
+_DNS_CACHE_TTL = 300
+
 
 class TrackerError(Exception):
     """Exception raised for tracker communication errors."""
@@ -18,9 +49,152 @@ class TrackerError(Exception):
     pass
 
 
+@lru_cache(maxsize=256)
+def _announce_url_prefix(announce_url: str, info_hash: bytes, peer_id: bytes, port: int) -> str:
+    """
+    Build the part of an HTTP announce URL that stays the same across announces.
+
+    Args:
+        announce_url: Tracker announce URL
+        info_hash: SHA-1 hash of the info dictionary
+        peer_id: Our peer ID
+        port: Port number for incoming connections
+
+    Returns:
+        Announce URL with the fixed query parameters
+    """
+    parsed = urllib.parse.urlparse(announce_url)
+    params = {
+        "info_hash": info_hash,
+        "peer_id": peer_id,
+        "port": port,
+        "compact": 1,  # Request compact peer list
+    }
+    query = urllib.parse.urlencode(params, doseq=False)
+    return f"{parsed.scheme}://{parsed.netloc}{parsed.path}?{query}"
+
+
+def _parse_compact_peers(data: bytes) -> list[dict[str, any]]:
+    """
+    Parse a compact peer list (6 bytes per peer, a trailing partial entry is ignored).
+
+    Args:
+        data: Compact peer data
+
+    Returns:
+        List of {"ip": str, "port": int} dictionaries
+    """
+    view = memoryview(data)[: len(data) - len(data) % _COMPACT_PEER.size]
+    inet_ntoa = socket.inet_ntoa
+    return [{"ip": inet_ntoa(ip), "port": port} for ip, port in _COMPACT_PEER.iter_unpack(view)]
+
+
+class UDPTrackerEndpoint(asyncio.DatagramProtocol):
+    """
+    UDP socket shared by all UDP tracker requests on an event loop.
+
+    Every request carries a random transaction ID that the tracker echoes
+    back, so replies from any number of trackers are matched to their
+    waiting requests through a single socket.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the endpoint (called by loop.create_datagram_endpoint)."""
+        self.transport: asyncio.DatagramTransport | None = None
+        self.pending: dict[int, asyncio.Future[bytes]] = {}
+        # Connection IDs per tracker address, with their expiry (monotonic time)
+        self.connection_ids: dict[tuple[str, int], tuple[int, float]] = {}
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Store the transport once the socket is bound."""
+        self.transport = transport  # type: ignore[assignment]
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        """Hand a reply to the request waiting on its transaction ID."""
+        if len(data) < 8:
+            return
+        (transaction_id,) = _TRANSACTION_ID.unpack_from(data, 4)
+        future = self.pending.get(transaction_id)
+        if future is not None and not future.done():
+            future.set_result(data)
+
+    def error_received(self, exc: Exception) -> None:
+        """Ignore ICMP errors: they cannot be tied to a request, whose wait times out instead."""
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Fail every waiting request once the socket is closed."""
+        self.transport = None
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(exc or ConnectionError("UDP tracker socket closed"))
+        self.pending.clear()
+
+    async def request(
+        self, payload: bytes, addr: tuple[str, int], transaction_id: int, timeouts: tuple[float, ...] = _UDP_TIMEOUTS
+    ) -> bytes:
+        """
+        Send a request and wait for the reply carrying the same transaction ID.
+
+        The request is resent after each timeout in turn; a reply to any of
+        the sends completes it.
+
+        Args:
+            payload: Request packet
+            addr: Resolved (IP, port) of the tracker
+            transaction_id: Transaction ID contained in payload
+            timeouts: Seconds to wait after each send
+
+        Returns:
+            The reply packet
+
+        Raises:
+            TimeoutError: If no reply arrives after the last send
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.pending[transaction_id] = future
+        try:
+            for timeout in timeouts:
+                self.transport.sendto(payload, addr)
+                # asyncio.wait (unlike wait_for) leaves the future pending for the next attempt
+                done, _ = await asyncio.wait((future,), timeout=timeout)
+                if done:
+                    return future.result()
+            raise TimeoutError
+        finally:
+            if self.pending.get(transaction_id) is future:
+                del self.pending[transaction_id]
+
+    def get_connection_id(self, addr: tuple[str, int]) -> int | None:
+        """Get the connection ID obtained from a tracker if it is still valid."""
+        cached = self.connection_ids.get(addr)
+        if cached is None:
+            return None
+        connection_id, expires_at = cached
+        if time.monotonic() >= expires_at:
+            del self.connection_ids[addr]
+            return None
+        return connection_id
+
+
 class Tracker:
     """Handles communication with BitTorrent trackers."""
 
+    # HTTP sessions shared by every Tracker, one per event loop (a session is bound to the
+    # loop it was created on); keeps DNS results and keep-alive connections across announces
+    _http_sessions: ClassVar[weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]] = (
+        weakref.WeakKeyDictionary()
+    )
+    # UDP endpoints shared by every Tracker, one per event loop
+    _udp_endpoints: ClassVar[weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, UDPTrackerEndpoint]] = (
+        weakref.WeakKeyDictionary()
+    )
+    # Serializes binding of the shared UDP endpoint so concurrent announces don't each bind a socket
+    _udp_endpoint_locks: ClassVar[weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]] = (
+        weakref.WeakKeyDictionary()
+    )
+    # Resolved UDP tracker addresses by (host, port), with their expiry (monotonic time)
+    _udp_addresses: ClassVar[dict[tuple[str, int], tuple[tuple[str, int], float]]] = {}
+
     def __init__(
         self,
         announce_url: str,
@@ -57,6 +231,65 @@ class Tracker:
         self.numwant = numwant
         self.transaction_id: int | None = None
 
+    @classmethod
+    def get_session(cls) -> aiohttp.ClientSession:
+        """
+        Get the HTTP session shared by trackers on the running event loop, creating it on first use.
+
+        Returns:
+            Open client session
+        """
+        loop = asyncio.get_running_loop()
+        session = cls._http_sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(limit=_HTTP_CONNECTION_LIMIT, ttl_dns_cache=_DNS_CACHE_TTL)
+            session = aiohttp.ClientSession(connector=connector)
+            cls._http_sessions[loop] = session
+        return session
+
+    @classmethod
+    async def get_udp_endpoint(cls) -> UDPTrackerEndpoint:
+        """
+        Get the UDP endpoint shared by trackers on the running event loop, binding it on first use.
+
+        Returns:
+            Bound endpoint
+        """
+        loop = asyncio.get_running_loop()
+        endpoint = cls._udp_endpoints.get(loop)
+        if endpoint is not None and endpoint.transport is not None:
+            return endpoint
+
+        lock = cls._udp_endpoint_locks.get(loop)
+        if lock is None:
+            lock = cls._udp_endpoint_locks[loop] = asyncio.Lock()
+        async with lock:
+            # Another announce may have bound the endpoint while we waited for the lock
+            endpoint = cls._udp_endpoints.get(loop)
+            if endpoint is None or endpoint.transport is None:
+                transport, endpoint = await loop.create_datagram_endpoint(
+                    UDPTrackerEndpoint, local_addr=("0.0.0.0", 0), family=socket.AF_INET
+                )
+                sock = transport.get_extra_info("socket")
+                if sock is not None:
+                    try:
+                        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _UDP_RECEIVE_BUFFER)
+                    except OSError:
+                        pass
+                cls._udp_endpoints[loop] = endpoint
+        return endpoint
+
+    @classmethod
+    async def close(cls) -> None:
+        """Close the running event loop's shared HTTP session and UDP endpoint, if they were opened."""
+        loop = asyncio.get_running_loop()
+        session = cls._http_sessions.pop(loop, None)
+        if session is not None:
+            await session.close()
+        endpoint = cls._udp_endpoints.pop(loop, None)
+        if endpoint is not None and endpoint.transport is not None:
+            endpoint.transport.close()
+
     async def announce(self) -> dict[str, any]:
         """
         Announce to tracker and get peer list.
@@ -73,32 +306,23 @@ class Tracker:
 
     async def _announce_http(self) -> dict[str, any]:
         """Announce via HTTP/HTTPS tracker."""
-        params = {
-            "info_hash": self.info_hash,
-            "peer_id": self.peer_id,
-            "port": self.port,
-            "uploaded": self.uploaded,
-            "downloaded": self.downloaded,
-            "left": self.left,
-            "compact": 1,  # Request compact peer list
-            "event": self.event,
-        }
+        # Only the transfer counters and the event change between announces
+        url = (
+            f"{_announce_url_prefix(self.announce_url, self.info_hash, self.peer_id, self.port)}"
+            f"&uploaded={self.uploaded}&downloaded={self.downloaded}&left={self.left}"
+            f"&event={urllib.parse.quote_plus(self.event)}"
+        )
         if self.numwant is not None:
-            params["numwant"] = self.numwant
-
-        # Build URL with query parameters
-        parsed = urllib.parse.urlparse(self.announce_url)
-        query = urllib.parse.urlencode(params, doseq=False)
-        url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}?{query}"
+            url += f"&numwant={self.numwant}"
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                    if response.status != 200:
-                        raise TrackerError(f"Tracker returned status {response.status}")
+            session = self.get_session()
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
+                if response.status != 200:
+                    raise TrackerError(f"Tracker returned status {response.status}")
 
-                    data = await response.read()
-                    return self._parse_tracker_response(data)
+                data = await response.read()
+                return self._parse_tracker_response(data)
         except TimeoutError as e:
             raise TrackerError("Tracker request timed out") from e
         except Exception as e:
@@ -111,73 +335,91 @@ class Tracker:
         port = parsed.port or 80
 
         try:
-            # Create UDP socket using asyncio
-            loop = asyncio.get_event_loop()
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            sock.setblocking(False)
+            addr = await self._resolve_udp_address(host, port)
+            endpoint = await self.get_udp_endpoint()
+
+            try:
+                # Send connect request, unless a recent connection ID can be reused
+                connection_id = endpoint.get_connection_id(addr)
+                if connection_id is None:
+                    connection_id = await self._udp_connect(endpoint, addr)
+                    endpoint.connection_ids[addr] = (connection_id, time.monotonic() + _CONNECTION_ID_LIFETIME)
+
+                # Send announce request
+                return await self._udp_announce(endpoint, addr, connection_id)
+            except TrackerError:
+                # The tracker may have moved or rejected the connection ID; start afresh next time
+                endpoint.connection_ids.pop(addr, None)
+                self._udp_addresses.pop((host, port), None)
+                raise
+        except Exception as e:
+            raise TrackerError(f"UDP tracker error: {e}") from e
 
-            # Connect to tracker
-            addr = (host, port)
+    async def _resolve_udp_address(self, host: str, port: int) -> tuple[str, int]:
+        """
+        Resolve a UDP tracker's address, reusing a recent result.
 
-            # Send connect request
-            connection_id, transaction_id = await self._udp_connect(sock, addr, loop)
+        Resolving before sending also keeps sendto() from resolving a hostname
+        synchronously on the event loop.
 
-            # Send announce request
-            response = await self._udp_announce(sock, addr, connection_id, transaction_id, loop)
+        Args:
+            host: Tracker hostname or IP address
+            port: Tracker port
 
-            sock.close()
-            return response
-        except Exception as e:
-            raise TrackerError(f"UDP tracker error: {e}") from e
+        Returns:
+            Numeric (IP, port) address
+        """
+        cached = self._udp_addresses.get((host, port))
+        if cached is not None and time.monotonic() < cached[1]:
+            return cached[0]
+
+        loop = asyncio.get_running_loop()
+        infos = await loop.getaddrinfo(host, port, family=socket.AF_INET, type=socket.SOCK_DGRAM)
+        addr = infos[0][4]
+        self._udp_addresses[(host, port)] = (addr, time.monotonic() + _DNS_CACHE_TTL)
+        return addr
 
-    async def _udp_connect(
-        self, sock: socket.socket, addr: tuple[str, int], loop: asyncio.AbstractEventLoop
-    ) -> tuple[int, int]:
+    async def _udp_connect(self, endpoint: UDPTrackerEndpoint, addr: tuple[str, int]) -> int:
         """
         Send UDP connect request.
 
         Returns:
-            Tuple of (connection_id, transaction_id)
+            Connection ID to use in the announce
         """
         transaction_id = random.randint(0, 0xFFFFFFFF)
 
         # Connect request: [0x41727101980][action=0][transaction_id]
-        connect_request = struct.pack(">QII", 0x41727101980, 0, transaction_id)
-
-        await loop.sock_sendto(sock, connect_request, addr)
+        connect_request = _CONNECT_REQUEST.pack(_UDP_PROTOCOL_ID, 0, transaction_id)
 
         # Receive response
         try:
-            data, _ = await asyncio.wait_for(loop.sock_recvfrom(sock, 16), timeout=10.0)
-            if len(data) < 16:
+            data = await endpoint.request(connect_request, addr, transaction_id)
+            if len(data) < _CONNECT_RESPONSE.size:
                 raise TrackerError("Invalid UDP connect response")
 
-            action, recv_transaction_id, connection_id = struct.unpack(">IIQ", data)
+            action, recv_transaction_id, connection_id = _CONNECT_RESPONSE.unpack_from(data)
 
             if action != 0:
                 raise TrackerError(f"UDP connect failed with action {action}")
             if recv_transaction_id != transaction_id:
                 raise TrackerError("Transaction ID mismatch")
 
-            return connection_id, transaction_id
+            return connection_id
         except TimeoutError as e:
             raise TrackerError("UDP connect timeout") from e
 
     async def _udp_announce(
         self,
-        sock: socket.socket,
+        endpoint: UDPTrackerEndpoint,
         addr: tuple[str, int],
         connection_id: int,
-        transaction_id: int,
-        loop: asyncio.AbstractEventLoop,
     ) -> dict[str, any]:
         """Send UDP announce request."""
         # Announce request structure:
         # [connection_id][action=1][transaction_id][info_hash][peer_id]
         # [downloaded][left][uploaded][event][IP][key][num_want][port]
 
-        event_map = {"started": 2, "stopped": 3, "completed": 1}
-        event_id = event_map.get(self.event, 0)
+        event_id = _UDP_EVENTS.get(self.event, 0)
 
         # Ensure info_hash and peer_id are exactly 20 bytes
         if len(self.info_hash) != 20:
@@ -186,8 +428,8 @@ class Tracker:
             raise TrackerError(f"Peer ID must be 20 bytes, got {len(self.peer_id)}")
 
         num_want = self.numwant if self.numwant is not None else -1
-        announce_request = struct.pack(
-            ">QII20s20sQQQIIIiH",
+        transaction_id = random.randint(0, 0xFFFFFFFF)
+        announce_request = _ANNOUNCE_REQUEST.pack(
             connection_id,
             1,  # action = announce
             transaction_id,
@@ -203,33 +445,21 @@ class Tracker:
             self.port,
         )
 
-        await loop.sock_sendto(sock, announce_request, addr)
-
         try:
-            data, _ = await asyncio.wait_for(loop.sock_recvfrom(sock, 4096), timeout=10.0)
-            if len(data) < 20:
+            data = await endpoint.request(announce_request, addr, transaction_id)
+            if len(data) < _ANNOUNCE_RESPONSE.size:
                 raise TrackerError("Invalid UDP announce response")
 
-            action, recv_transaction_id = struct.unpack(">II", data[:8])
+            # Parse response: [action][transaction_id][interval][leechers][seeders][peers...]
+            action, recv_transaction_id, interval, leechers, seeders = _ANNOUNCE_RESPONSE.unpack_from(data)
 
             if action != 1:
                 raise TrackerError(f"UDP announce failed with action {action}")
             if recv_transaction_id != transaction_id:
                 raise TrackerError("Transaction ID mismatch")
 
-            # Parse response: [action][transaction_id][interval][leechers][seeders][peers...]
-            interval, leechers, seeders = struct.unpack(">III", data[8:20])
-
             # Parse compact peer list (6 bytes per peer: 4 bytes IP + 2 bytes port)
-            peers_data = data[20:]
-            peers = []
-
-            for i in range(0, len(peers_data), 6):
-                if i + 6 > len(peers_data):
-                    break
-                ip_bytes, port = struct.unpack(">IH", peers_data[i : i + 6])
-                ip = socket.inet_ntoa(struct.pack(">I", ip_bytes))
-                peers.append({"ip": ip, "port": port})
+            peers = _parse_compact_peers(data[_ANNOUNCE_RESPONSE.size :])
 
             return {"interval": interval, "complete": seeders, "incomplete": leechers, "peers": peers}
         except TimeoutError as e:
@@ -245,65 +475,7 @@ class Tracker:
         Returns:
             Parsed tracker response dictionary
         """
-
-        # Create a temporary parser to decode the response
-        class TempParser:
-            def __init__(self, data: bytes):
-                self._raw_data = data
-
-            def _decode_bencode(self, data: bytes, index: int) -> tuple[any, int]:
-                if index >= len(data):
-                    raise ValueError(f"Unexpected end of data at index {index}")
-
-                char = data[index : index + 1]
-
-                if char == b"i":
-                    end_index = data.find(b"e", index + 1)
-                    if end_index == -1:
-                        raise ValueError(f"Unterminated integer at index {index}")
-                    value = int(data[index + 1 : end_index])
-                    return value, end_index + 1
-
-                elif char == b"l":
-                    index += 1
-                    result = []
-                    while index < len(data) and data[index : index + 1] != b"e":
-                        value, index = self._decode_bencode(data, index)
-                        result.append(value)
-                    if index >= len(data):
-                        raise ValueError(f"Unterminated list at index {index}")
-                    return result, index + 1
-
-                elif char == b"d":
-                    index += 1
-                    result = {}
-                    while index < len(data) and data[index : index + 1] != b"e":
-                        key, index = self._decode_bencode(data, index)
-                        value, index = self._decode_bencode(data, index)
-                        if isinstance(key, bytes):
-                            key = key.decode("utf-8", errors="replace")
-                        result[key] = value
-                    if index >= len(data):
-                        raise ValueError(f"Unterminated dictionary at index {index}")
-                    return result, index + 1
-
-                elif char.isdigit():
-                    colon_index = data.find(b":", index)
-                    if colon_index == -1:
-                        raise ValueError(f"No colon found for string at index {index}")
-                    length = int(data[index:colon_index])
-                    start_index = colon_index + 1
-                    end_index = start_index + length
-                    if end_index > len(data):
-                        raise ValueError(f"String length exceeds data at index {index}")
-                    value = data[start_index:end_index]
-                    return value, end_index
-
-                else:
-                    raise ValueError(f"Unexpected character at index {index}")
-
-        parser = TempParser(data)
-        response, _ = parser._decode_bencode(data, 0)
+        response, _ = bencode_decode(data)
 
         if not isinstance(response, dict):
             raise TrackerError("Invalid tracker response format")
@@ -315,12 +487,7 @@ class Tracker:
 
             # Compact format: binary string with 6 bytes per peer
             if isinstance(peers_data, bytes):
-                for i in range(0, len(peers_data), 6):
-                    if i + 6 > len(peers_data):
-                        break
-                    ip_bytes, port = struct.unpack(">IH", peers_data[i : i + 6])
-                    ip = socket.inet_ntoa(struct.pack(">I", ip_bytes))
-                    peers.append({"ip": ip, "port": port})
+                peers = _parse_compact_peers(peers_data)
             # List format: list of dictionaries
             elif isinstance(peers_data, list):
                 for peer in peers_data:
@@ -349,5 +516,4 @@ def generate_peer_id() -> bytes:
     # BitTorrent peer ID format: -<client_id><random>
     # Using '-TS' as client ID (Torrent Study)
     client_id = b"-TS0001-"
-    random_bytes = bytes([random.randint(0, 255) for _ in range(12)])
-    return client_id + random_bytes
+    return client_id + os.urandom(12)
@@ -2,10 +2,17 @@
 Utility formatting functions for the TUI.
 """
 
+from functools import lru_cache
+
 
 def format_seconds(seconds: float) -> str:
     """Format seconds into a human-readable time string."""
-    seconds = max(0, int(seconds))
+    return _format_whole_seconds(max(0, int(seconds)))
+
+
+@lru_cache(maxsize=4096)
+def _format_whole_seconds(seconds: int) -> str:
+    """Format a whole number of seconds (cached: the elapsed time only changes once a second)."""
     hours, remainder = divmod(seconds, 3600)
     minutes, secs = divmod(remainder, 60)
     if hours > 0:
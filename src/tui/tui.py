@@ -22,6 +22,7 @@ class TorrentTUI:
         self.name = name
         self.total_pieces = total_pieces
         self.total_bytes = total_bytes
+        self._total_size_text = format_size(total_bytes)
         self.start_time = time.time()
         self.stdscr: curses._CursesWindow | None = None
         self.enabled = sys.stdout.isatty()
@@ -33,6 +34,10 @@ class TorrentTUI:
         # Cache for last stats to avoid flicker
         self._last_stats: dict = {}
 
+        # Full-width progress bar templates, rebuilt only when the terminal width changes
+        self._bar_filled = ""
+        self._bar_empty = ""
+
         # Log handler reference
         self._log_handler: TUILogHandler | None = None
 
@@ -192,8 +197,11 @@ class TorrentTUI:
                 progress_attr = curses.color_pair(ColorPairs.PROGRESS) | curses.A_BOLD
             else:
                 progress_attr = curses.A_BOLD
-            bar_empty = "-" * (bar_width - filled)
-            bar_filled = "#" * filled
+            if len(self._bar_filled) != bar_width:
+                self._bar_filled = "#" * bar_width
+                self._bar_empty = "-" * bar_width
+            bar_filled = self._bar_filled[:filled]
+            bar_empty = self._bar_empty[: bar_width - filled]
 
             self._safe_addstr(3, 2, "[", 0)
             self._safe_addstr(3, 3, bar_filled, progress_attr)
@@ -226,7 +234,7 @@ class TorrentTUI:
             self._safe_addstr(6, 2, stats_line2[:content_width], speed_attr)
 
             # Stats row 3: Download progress
-            stats_line3 = f" 📥 Downloaded: {format_size(downloaded_bytes)} / {format_size(self.total_bytes)}"
+            stats_line3 = f" 📥 Downloaded: {format_size(downloaded_bytes)} / {self._total_size_text}"
             self._safe_addstr(7, 2, stats_line3[:content_width], stats_attr)
 
             # Render logs (starting from row 11)
@@ -0,0 +1,143 @@
+"""Tests for piece bitfield helpers."""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bitfield import (
+    accumulate_bits,
+    bitfield_size,
+    clear_bit,
+    count_bits,
+    difference,
+    has_bit,
+    intersection,
+    intersects,
+    merge_into,
+    set_bit,
+    set_bit_indices,
+)
+
+
+class TestBitfieldSize:
+    """Tests for bitfield_size()."""
+
+    def test_exact_bytes(self) -> None:
+        """Test piece counts that fill whole bytes."""
+        assert bitfield_size(0) == 0
+        assert bitfield_size(16) == 2
+
+    def test_partial_byte(self) -> None:
+        """Test piece counts that need a trailing partial byte."""
+        assert bitfield_size(1) == 1
+        assert bitfield_size(17) == 3
+
+
+class TestBitAccess:
+    """Tests for has_bit() and set_bit()."""
+
+    def test_high_bit_is_index_zero(self) -> None:
+        """Test that index 0 maps to the high bit of the first byte."""
+        bitfield = bytearray(b"\x80\x01")
+        assert has_bit(bitfield, 0)
+        assert has_bit(bitfield, 15)
+        assert not has_bit(bitfield, 1)
+
+    def test_out_of_range(self) -> None:
+        """Test that out-of-range indices are reported as clear."""
+        bitfield = bytearray(b"\xff")
+        assert not has_bit(bitfield, 8)
+        assert not has_bit(bitfield, -1)
+
+    def test_set_bit_grows(self) -> None:
+        """Test that setting a bit past the end grows the bitfield."""
+        bitfield = bytearray()
+        set_bit(bitfield, 9)
+        assert bitfield == bytearray(b"\x00\x40")
+
+    def test_clear_bit(self) -> None:
+        """Test clearing bits, including past the end."""
+        bitfield = bytearray(b"\xff")
+        clear_bit(bitfield, 0)
+        clear_bit(bitfield, 20)
+        assert bitfield == bytearray(b"\x7f")
+
+
+class TestBitfieldOperations:
+    """Tests for merging, subtracting and scanning bitfields."""
+
+    def test_merge_into(self) -> None:
+        """Test OR-ing a longer bitfield into a shorter one."""
+        target = bytearray(b"\x80")
+        merge_into(target, b"\x01\x80")
+        assert target == bytearray(b"\x81\x80")
+
+    def test_merge_into_empty(self) -> None:
+        """Test merging into an all-zero bitfield copies the other bitfield."""
+        target = bytearray(3)
+        merge_into(target, memoryview(b"\x81\x80"))
+        assert target == bytearray(b"\x81\x80\x00")
+
+    def test_merge_into_max_size(self) -> None:
+        """Test that bytes of the merged bitfield past max_size are dropped."""
+        target = bytearray(2)
+        merge_into(target, b"\x81\x80\xff\xff", max_size=2)
+        assert target == bytearray(b"\x81\x80")
+
+    def test_intersects(self) -> None:
+        """Test detecting shared bits between bitfields of different lengths."""
+        assert intersects(b"\x80\x01", b"\x81")
+        assert not intersects(b"\x40\x01", b"\x80")
+        assert not intersects(b"", b"\xff")
+
+    def test_intersection(self) -> None:
+        """Test AND-ing with a shorter bitfield."""
+        assert intersection(b"\xff\x0f", b"\xf0") == b"\xf0\x00"
+
+    def test_difference(self) -> None:
+        """Test subtracting a shorter bitfield."""
+        assert difference(b"\xff\x0f", b"\xf0") == b"\x0f\x0f"
+
+    def test_count_bits(self) -> None:
+        """Test counting set bits."""
+        assert count_bits(b"\xa0\x01") == 3
+        assert count_bits(b"") == 0
+
+    def test_set_bit_indices(self) -> None:
+        """Test listing set bits in order."""
+        assert set_bit_indices(b"\xa0\x01") == [0, 2, 15]
+        assert set_bit_indices(b"") == []
+        assert set_bit_indices(b"\x00\x00") == []
+
+    def test_set_bit_indices_limit(self) -> None:
+        """Test that spare bits past the limit are ignored."""
+        assert set_bit_indices(b"\x81\xff", 10) == [0, 7, 8, 9]
+        assert set_bit_indices(b"\xff", 0) == []
+
+
+class TestAccumulateBits:
+    """Tests for accumulate_bits()."""
+
+    def test_sparse_increment(self) -> None:
+        """Test incrementing counts for a few set bits."""
+        counts = [0] * 16
+        accumulate_bits(counts, b"\x80\x01")
+        assert counts == [1] + [0] * 14 + [1]
+
+    def test_dense_increment(self) -> None:
+        """Test incrementing counts for a mostly-set bitfield, ignoring spare bits."""
+        counts = [1] * 10
+        accumulate_bits(counts, b"\xff\xff")
+        assert counts == [2] * 10
+
+    def test_decrement_clamps_at_zero(self) -> None:
+        """Test that decrementing never goes below zero on either path."""
+        dense = [1, 0, 3, 0, 1, 1, 1, 1]
+        accumulate_bits(dense, b"\xff", -1)
+        assert dense == [0, 0, 2, 0, 0, 0, 0, 0]
+
+        sparse = [0] * 16
+        accumulate_bits(sparse, b"\x80", -1)
+        assert sparse == [0] * 16
@@ -173,3 +173,19 @@ class TestBencodeRoundtrip:
         decoded, _ = bencode_decode(encoded)
         assert decoded["list"] == [1, 2, 3]
         assert decoded["dict"]["nested"] == b"value"
+
+    def test_decode_deeply_nested(self) -> None:
+        """Test that nesting deeper than the recursion limit still decodes."""
+        depth = 5000
+        value, end = bencode_decode(b"l" * depth + b"i1e" + b"e" * depth)
+
+        assert end == 2 * depth + 3
+        for _ in range(depth):
+            assert isinstance(value, list) and len(value) == 1
+            value = value[0]
+        assert value == 1
+
+    def test_decode_string_length_too_long(self) -> None:
+        """Test that an implausibly long string length in untrusted data is rejected."""
+        with pytest.raises(ValueError, match="No colon found"):
+            bencode_decode(b"1" * 100 + b":abc")
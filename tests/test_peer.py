@@ -0,0 +1,48 @@
+"""Tests for peer message handling."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from peer import _MAX_PIECE_COUNT, Peer
+
+
+def _peer(piece_count: int = 10) -> Peer:
+    """Create an unconnected peer."""
+    return Peer("127.0.0.1", 6881, b"\x01" * 20, b"\x02" * 20, piece_count=piece_count)
+
+
+class TestPeerAvailability:
+    """Tests for HAVE and BITFIELD bookkeeping."""
+
+    def test_have_sets_piece(self) -> None:
+        """Test that a HAVE for a valid index marks the piece."""
+        peer = _peer()
+        asyncio.run(peer.handle_have((9).to_bytes(4, "big")))
+        assert peer.has_piece(9)
+        assert peer.bitfield == bytearray(b"\x00\x40")
+
+    def test_have_out_of_range_ignored(self) -> None:
+        """Test that a HAVE past the piece count does not grow the bitfield."""
+        peer = _peer()
+        asyncio.run(peer.handle_have((10).to_bytes(4, "big")))
+        asyncio.run(peer.handle_have((0xFFFFFFF0).to_bytes(4, "big")))
+        assert peer.bitfield == bytearray(2)
+
+    def test_have_unknown_piece_count_capped(self) -> None:
+        """Test that without a piece count HAVE indices are still bounded."""
+        peer = _peer(piece_count=0)
+        asyncio.run(peer.handle_have((100).to_bytes(4, "big")))
+        asyncio.run(peer.handle_have(_MAX_PIECE_COUNT.to_bytes(4, "big")))
+        assert peer.has_piece(100)
+        assert len(peer.bitfield) == 13
+
+    def test_oversized_bitfield_truncated(self) -> None:
+        """Test that a BITFIELD longer than the piece count needs is cut to size."""
+        peer = _peer()
+        asyncio.run(peer.handle_bitfield(b"\xff" * 1024))
+        assert peer.bitfield == bytearray(b"\xff\xff")
+        assert not peer.has_piece(16)
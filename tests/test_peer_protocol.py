@@ -0,0 +1,102 @@
+"""Tests for the buffered peer connection protocol."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from peer_protocol import open_peer_connection
+
+
+async def _serve_and_read(chunks: list[bytes], reads: list[int], into: bool = False) -> list[bytes]:
+    """Serve chunks from a loopback server and read them back with readexactly() or readinto()."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        for chunk in chunks:
+            writer.write(chunk)
+            await writer.drain()
+            await asyncio.sleep(0.01)
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        connection = await open_peer_connection("127.0.0.1", port)
+        results = []
+        for n in reads:
+            if into:
+                buffer = bytearray(n)
+                await connection.readinto(memoryview(buffer))
+                results.append(bytes(buffer))
+            else:
+                results.append(await connection.readexactly(n))
+        connection.close()
+        await connection.wait_closed()
+        return results
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+class TestPeerProtocol:
+    """Tests for PeerProtocol reads and writes."""
+
+    def test_readexactly_across_chunks(self) -> None:
+        """Test that reads are reassembled across separate network writes."""
+        results = asyncio.run(_serve_and_read([b"\x00\x00", b"\x00\x05\x04abcd"], [4, 5]))
+        assert results == [b"\x00\x00\x00\x05", b"\x04abcd"]
+
+    def test_readexactly_larger_than_buffer(self) -> None:
+        """Test reading a message larger than the initial receive buffer."""
+        payload = bytes(range(256)) * 4096  # 1 MiB
+        results = asyncio.run(_serve_and_read([payload[:1000], payload[1000:]], [len(payload)]))
+        assert results == [payload]
+
+    def test_readexactly_above_high_water(self) -> None:
+        """Test that a read larger than the pause threshold still completes."""
+        payload = bytes(range(256)) * 4096 * 6  # 6 MiB
+        results = asyncio.run(asyncio.wait_for(_serve_and_read([payload], [len(payload)]), 5))
+        assert results == [payload]
+
+    def test_readinto(self) -> None:
+        """Test filling caller-supplied buffers across separate network writes."""
+        payload = bytes(range(256)) * 1024
+        results = asyncio.run(_serve_and_read([payload[:100], payload[100:]], [4, len(payload) - 4], into=True))
+        assert results == [payload[:4], payload[4:]]
+
+    def test_incomplete_read(self) -> None:
+        """Test that a connection closing mid-message raises IncompleteReadError."""
+        with pytest.raises(asyncio.IncompleteReadError) as exc_info:
+            asyncio.run(_serve_and_read([b"abc"], [10]))
+        assert exc_info.value.partial == b"abc"
+
+    def test_write_and_drain(self) -> None:
+        """Test that write() and writelines() reach the remote end in order."""
+
+        async def run() -> bytes:
+            received = asyncio.get_running_loop().create_future()
+
+            async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+                received.set_result(await reader.readexactly(9))
+                writer.close()
+
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                connection = await open_peer_connection("127.0.0.1", port)
+                connection.write(b"abc")
+                connection.writelines((b"def", memoryview(b"ghi")))
+                await connection.drain()
+                data = await received
+                connection.close()
+                await connection.wait_closed()
+                return data
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        assert asyncio.run(run()) == b"abcdefghi"
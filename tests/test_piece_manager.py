@@ -0,0 +1,113 @@
+"""Tests for piece block bookkeeping."""
+
+import asyncio
+import sys
+from hashlib import sha1
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from piece_manager import BLOCK_SIZE, PieceManager, PieceStatus
+
+# Two full blocks and a short last block
+PIECE_LENGTH = 2 * BLOCK_SIZE + 100
+PIECE_DATA = bytes(i % 251 for i in range(PIECE_LENGTH))
+
+
+def _manager() -> PieceManager:
+    """Create a manager for a single three-block piece."""
+    return PieceManager([(0, PIECE_LENGTH, sha1(PIECE_DATA).digest())], total_pieces=1)
+
+
+def _block(offset: int, length: int = BLOCK_SIZE) -> bytes:
+    """Get a slice of the test piece data."""
+    return PIECE_DATA[offset : offset + length]
+
+
+class TestPieceBlocks:
+    """Tests for block layout and received data."""
+
+    def test_short_last_block(self) -> None:
+        """Test that the last block covers only the remainder of the piece."""
+        manager = _manager()
+        piece = manager.get_piece(0)
+        assert len(piece.received) == 3
+        assert piece.block_length(0) == BLOCK_SIZE
+        assert piece.block_length(2) == 100
+
+        manager.mark_block_requested(0, 0)
+        manager.mark_block_requested(0, BLOCK_SIZE)
+        block = manager.get_next_block_to_request(0)
+        assert (block.offset, block.length) == (2 * BLOCK_SIZE, 100)
+
+    def test_rejects_misaligned_and_wrong_length_blocks(self) -> None:
+        """Test that blocks not matching the block layout are dropped."""
+        manager = _manager()
+        piece = manager.get_piece(0)
+
+        manager.add_block_data(0, 1, _block(1))  # Not on a block boundary
+        manager.add_block_data(0, 3 * BLOCK_SIZE, _block(0, 100))  # Past the end of the piece
+        manager.add_block_data(0, 0, _block(0, BLOCK_SIZE - 1))  # Short full block
+        manager.add_block_data(0, 2 * BLOCK_SIZE, _block(2 * BLOCK_SIZE) + b"x")  # Long last block
+
+        assert piece.buffer is None
+        assert piece.received == bytearray(3)
+        assert not manager.is_piece_complete(0)
+
+    def test_next_block_skips_received_blocks(self) -> None:
+        """Test that received blocks are skipped and blocks whose request was cleared are re-offered."""
+        manager = _manager()
+        for offset in (0, BLOCK_SIZE):
+            manager.mark_block_requested(0, offset)
+
+        # Block 0 arrives; block 1's request is given up without data
+        manager.add_block_data(0, 0, _block(0))
+        manager.mark_block_received(0, 0)
+        manager.mark_block_received(0, BLOCK_SIZE)
+
+        assert manager.get_next_block_to_request(0).offset == BLOCK_SIZE
+        manager.mark_block_requested(0, BLOCK_SIZE)
+        assert manager.get_next_block_to_request(0).offset == 2 * BLOCK_SIZE
+        manager.mark_block_requested(0, 2 * BLOCK_SIZE)
+        assert manager.get_next_block_to_request(0) is None
+
+    def test_assemble_piece_hands_back_buffer(self) -> None:
+        """Test that the assembled piece is the receive buffer itself, once all blocks are in."""
+        manager = _manager()
+        piece = manager.get_piece(0)
+
+        # Blocks may arrive in any order
+        for offset in (2 * BLOCK_SIZE, 0):
+            manager.add_block_data(0, offset, _block(offset))
+        assert manager.assemble_piece(0) is None
+
+        manager.add_block_data(0, BLOCK_SIZE, _block(BLOCK_SIZE))
+        buffer = piece.buffer
+        data = manager.assemble_piece(0)
+
+        assert data is buffer
+        assert data == PIECE_DATA
+        assert piece.buffer is None
+        assert manager.verify_piece(0, data)
+
+    def test_reset_after_failed_piece(self) -> None:
+        """Test that a failed piece drops its data and block state and can be downloaded again."""
+        manager = _manager()
+        piece = manager.get_piece(0)
+
+        async def run() -> None:
+            assert await manager.mark_piece_downloading(0)
+            for offset in (0, BLOCK_SIZE):
+                manager.mark_block_requested(0, offset)
+                manager.add_block_data(0, offset, _block(offset))
+            await manager.mark_piece_failed(0)
+
+        asyncio.run(run())
+
+        assert piece.status == PieceStatus.MISSING
+        assert piece.buffer is None
+        assert piece.requested == bytearray(3)
+        assert piece.received == bytearray(3)
+        assert manager.get_next_block_to_request(0).offset == 0
+        assert manager.get_next_piece_to_download(b"\x80") is piece
@@ -1,11 +1,16 @@
 """Tests for the torrent parser module."""
 
 import hashlib
+import sys
 from pathlib import Path
 
 import pytest
 
-from src.torrent_parser import (
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import torrent_parser
+from torrent_parser import (
     BencodeError,
     Torrent,
     TorrentFile,
@@ -109,6 +114,49 @@ class TestBencodeDecoding:
         with pytest.raises(BencodeError, match="Unexpected character"):
             parser.parse()
 
+    def test_invalid_torrent_not_a_dictionary(self, tmp_path: Path) -> None:
+        """Test that a torrent file holding a list is rejected without decoding it."""
+        torrent_file = tmp_path / "test.torrent"
+        torrent_file.write_bytes(b"l" + b"i1e" * 1000)  # Unterminated, but never decoded
+
+        parser = TorrentParser(torrent_file)
+        with pytest.raises(BencodeError, match="must start with a dictionary"):
+            parser.parse()
+
+    def test_torrent_file_too_large(self, tmp_path: Path) -> None:
+        """Test that files over the size limit are rejected."""
+        torrent_file = tmp_path / "test.torrent"
+        torrent_file.write_bytes(b"d4:name4:teste")
+
+        parser = TorrentParser(torrent_file)
+        with pytest.raises(BencodeError, match="larger than 10 bytes"):
+            parser.parse(max_size=10)
+
+    def test_decode_string_length_too_long(self) -> None:
+        """Test that an implausibly long string length is rejected without searching far for a colon."""
+        with pytest.raises(BencodeError, match="No colon found"):
+            TorrentParser()._decode_bencode(b"1" * 100 + b":abc", 0)
+
+    def test_decode_deeply_nested(self) -> None:
+        """Test that nesting deeper than the recursion limit still decodes."""
+        depth = 5000
+        value, end = TorrentParser()._decode_bencode(b"l" * depth + b"i1e" + b"e" * depth, 0)
+
+        assert end == 2 * depth + 3
+        for _ in range(depth):
+            assert isinstance(value, list) and len(value) == 1
+            value = value[0]
+        assert value == 1
+
+    def test_encode_deeply_nested(self) -> None:
+        """Test that nesting deeper than the recursion limit still encodes."""
+        depth = 5000
+        value: list = [1]
+        for _ in range(depth - 1):
+            value = [value]
+
+        assert TorrentParser()._encode_bencode(value) == b"l" * depth + b"i1e" + b"e" * depth
+
 
 class TestTorrentFile:
     """Tests for TorrentFile model."""
@@ -174,6 +222,8 @@ class TestTorrentInfo:
 
         assert info.get_piece_hash(0) == piece1
         assert info.get_piece_hash(1) == piece2
+        assert info.piece_hashes == [piece1, piece2]
+        assert "piece_hashes" not in info.model_dump()
 
     def test_get_piece_hash_out_of_range(self) -> None:
         """Test piece hash index out of range."""
@@ -203,6 +253,11 @@ class TestTorrentInfo:
         assert len(files) == 1
         assert files[0].path == ["myfile.txt"]
         assert files[0].length == 1024
+        assert "file_list" not in info.model_dump()
+
+        # Callers get their own list, so changing it leaves the cached files intact
+        files.clear()
+        assert len(info.get_files()) == 1
 
     def test_get_files_multi_file(self) -> None:
         """Test get_files for multi-file torrent."""
@@ -262,6 +317,9 @@ class TestTorrent:
         # No duplicates
         assert len(urls) == len(set(urls))
 
+        urls.append("http://injected.example.com")
+        assert torrent.get_announce_urls() == urls[:-1]
+
     def test_creation_datetime(self) -> None:
         """Test creation datetime conversion."""
         torrent = Torrent(
@@ -370,6 +428,34 @@ class TestTorrentParser:
         assert info_hash_bytes == expected_hash
         assert len(info_hash_bytes) == 20
 
+    def test_get_info_hash_uses_raw_bytes(self, tmp_path: Path) -> None:
+        """Test that the info hash covers the file bytes, even if keys are not in canonical order."""
+        torrent_file = tmp_path / "test.torrent"
+        info_dict = b"d4:name8:test.txt6:lengthi1024e12:piece lengthi16384e6:pieces20:01234567890123456789e"
+        content = b"d8:announce3:url4:info" + info_dict + b"7:comment2:hie"
+        torrent_file.write_bytes(content)
+
+        parser = TorrentParser(torrent_file)
+        parser.parse()
+
+        assert parser.get_info_hash() == hashlib.sha1(info_dict).hexdigest()
+        assert parser.torrent.comment == "hi"
+
+    def test_get_info_hash_reset_on_reparse(self, tmp_path: Path) -> None:
+        """Test that a cached info hash is recomputed after parsing a changed file."""
+        torrent_file = tmp_path / "test.torrent"
+        first_info = b"d6:lengthi1024e4:name4:test12:piece lengthi16384e6:pieces20:01234567890123456789e"
+        torrent_file.write_bytes(b"d4:info" + first_info + b"e")
+
+        parser = TorrentParser(torrent_file)
+        parser.parse()
+        assert parser.get_info_hash() == hashlib.sha1(first_info).hexdigest()
+
+        second_info = first_info.replace(b"i1024e", b"i2048e")
+        torrent_file.write_bytes(b"d4:info" + second_info + b"e")
+        parser.parse()
+        assert parser.get_info_hash() == hashlib.sha1(second_info).hexdigest()
+
     def test_torrent_property_auto_parse(self, tmp_path: Path) -> None:
         """Test that torrent property auto-parses if needed."""
         torrent_file = tmp_path / "test.torrent"
@@ -491,3 +577,67 @@ class TestBencodeEncoding:
         hash1 = parser.get_info_hash()
         hash2 = parser.get_info_hash()
         assert hash1 == hash2
+
+
+def _keys_to_bytes(value: object) -> object:
+    """Turn decoded dict keys back into bytes, as fastbencode returns them."""
+    if isinstance(value, dict):
+        return {key.encode(): _keys_to_bytes(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_keys_to_bytes(item) for item in value]
+    return value
+
+
+def _install_fake_fastbencode(monkeypatch: pytest.MonkeyPatch) -> dict[str, int]:
+    """Stand in for fastbencode with the pure-Python codec, counting calls."""
+    calls = {"bdecode": 0, "bencode": 0}
+
+    def bdecode(data: bytes) -> object:
+        calls["bdecode"] += 1
+        value, end = TorrentParser()._decode_bencode(data, 0)
+        if end != len(data):
+            raise ValueError("trailing data")
+        return _keys_to_bytes(value)
+
+    def bencode(value: object) -> bytes:
+        calls["bencode"] += 1
+        return TorrentParser()._encode_bencode(value)
+
+    monkeypatch.setattr(torrent_parser, "_fast_bdecode", bdecode)
+    monkeypatch.setattr(torrent_parser, "_fast_bencode", bencode)
+    return calls
+
+
+class TestNativeDecoding:
+    """Tests for the fastbencode decoding path, with fastbencode stubbed out."""
+
+    INFO = b"d6:lengthi1024e4:name8:test.txt12:piece lengthi16384e6:pieces20:01234567890123456789e"
+
+    def test_info_is_last_key(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the info span is found by skipping the keys before it."""
+        calls = _install_fake_fastbencode(monkeypatch)
+        torrent_file = tmp_path / "test.torrent"
+        torrent_file.write_bytes(b"d8:announce20:http://tracker.local4:info" + self.INFO + b"e")
+
+        parser = TorrentParser(torrent_file)
+        torrent = parser.parse()
+
+        assert calls == {"bdecode": 1, "bencode": 0}
+        assert torrent.info.name == "test.txt"
+        assert torrent.announce == "http://tracker.local"
+        assert parser.get_info_hash_bytes() == hashlib.sha1(self.INFO).digest()
+
+    def test_info_followed_by_other_keys(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the info span is found by searching for the re-encoded info dictionary."""
+        calls = _install_fake_fastbencode(monkeypatch)
+        torrent_file = tmp_path / "test.torrent"
+        torrent_file.write_bytes(
+            b"d8:announce20:http://tracker.local4:info" + self.INFO + b"8:url-listl18:http://seed.local/ee"
+        )
+
+        parser = TorrentParser(torrent_file)
+        torrent = parser.parse()
+
+        assert calls == {"bdecode": 1, "bencode": 1}
+        assert torrent.info.name == "test.txt"
+        assert parser.get_info_hash_bytes() == hashlib.sha1(self.INFO).digest()
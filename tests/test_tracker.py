@@ -0,0 +1,280 @@
+"""Tests for tracker communication."""
+
+import asyncio
+import socket
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+from aiohttp import web
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from tracker import Tracker, TrackerError, generate_peer_id
+
+
+class TestSharedUDPEndpoint:
+    """Tests for the UDP endpoint shared by trackers."""
+
+    def test_concurrent_callers_share_one_endpoint(self) -> None:
+        """Test that announces racing to bind the endpoint all get the same socket."""
+
+        async def run() -> None:
+            try:
+                endpoints = await asyncio.gather(*(Tracker.get_udp_endpoint() for _ in range(5)))
+                assert all(endpoint is endpoints[0] for endpoint in endpoints)
+                assert await Tracker.get_udp_endpoint() is endpoints[0]
+            finally:
+                await Tracker.close()
+
+        asyncio.run(run())
+
+    def test_close_releases_endpoint(self) -> None:
+        """Test that closing the trackers closes the shared socket and the next caller binds a new one."""
+
+        async def run() -> None:
+            endpoint = await Tracker.get_udp_endpoint()
+            await Tracker.close()
+            await asyncio.sleep(0)  # connection_lost runs on the next loop iteration
+            assert endpoint.transport is None
+            try:
+                assert await Tracker.get_udp_endpoint() is not endpoint
+            finally:
+                await Tracker.close()
+
+        asyncio.run(run())
+
+
+class _FakeUDPTracker(asyncio.DatagramProtocol):
+    """Loopback BEP 15 tracker that answers connect and announce requests."""
+
+    def __init__(self, drop: int = 0, hold: int = 0, junk: bool = False, fail_announce: bool = False) -> None:
+        self.transport: asyncio.DatagramTransport | None = None
+        self.requests: list[bytes] = []
+        self.drop = drop  # Number of requests to ignore, as if the packets were lost
+        self.hold = hold  # Collect this many replies, then send them in reverse order
+        self.held: list[tuple[bytes, tuple[str, int]]] = []
+        self.junk = junk  # Send a datagram too short to carry a transaction ID before each reply
+        self.fail_announce = fail_announce
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport  # type: ignore[assignment]
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        self.requests.append(data)
+        if self.drop:
+            self.drop -= 1
+            return
+        if self.junk:
+            self.transport.sendto(b"\x00\x00\x00\x00", addr)
+        self.held.append((self._reply(data), addr))
+        if len(self.held) >= self.hold:
+            for reply, reply_addr in reversed(self.held):
+                self.transport.sendto(reply, reply_addr)
+            self.held.clear()
+
+    def _reply(self, data: bytes) -> bytes:
+        if len(data) == 16:
+            _, _, transaction_id = struct.unpack(">QII", data)
+            # Connection ID derived from the transaction ID, so tests can tell replies apart
+            return struct.pack(">IIQ", 0, transaction_id, transaction_id + 1000)
+        (transaction_id,) = struct.unpack_from(">I", data, 12)
+        if self.fail_announce:
+            return struct.pack(">II", 3, transaction_id) + b"torrent not registered"
+        peer = socket.inet_aton("10.0.0.1") + struct.pack(">H", 6881)
+        return struct.pack(">IIIII", 1, transaction_id, 1800, 2, 5) + peer
+
+    @property
+    def connect_count(self) -> int:
+        return sum(len(request) == 16 for request in self.requests)
+
+
+async def _start_fake_tracker(**kwargs: Any) -> tuple[asyncio.DatagramTransport, _FakeUDPTracker, tuple[str, int]]:
+    """Bind a fake UDP tracker on a loopback port."""
+    transport, tracker = await asyncio.get_running_loop().create_datagram_endpoint(
+        lambda: _FakeUDPTracker(**kwargs), local_addr=("127.0.0.1", 0)
+    )
+    return transport, tracker, transport.get_extra_info("sockname")
+
+
+def _connect_request(transaction_id: int) -> bytes:
+    """Build a UDP connect request."""
+    return struct.pack(">QII", 0x41727101980, 0, transaction_id)
+
+
+def _udp_tracker(addr: tuple[str, int]) -> Tracker:
+    """Create a Tracker announcing to a loopback UDP tracker."""
+    return Tracker(f"udp://{addr[0]}:{addr[1]}/announce", b"\x01" * 20, generate_peer_id(), 6881)
+
+
+async def _start_fake_http_tracker() -> tuple[web.AppRunner, str]:
+    """Serve a loopback HTTP tracker that returns one compact peer."""
+
+    async def announce(request: web.Request) -> web.Response:
+        return web.Response(body=b"d8:intervali1800e5:peers6:\x0a\x00\x00\x01\x1a\xe1e")
+
+    app = web.Application()
+    app.router.add_get("/announce", announce)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    return runner, f"http://{host}:{port}/announce"
+
+
+class TestTrackerClose:
+    """Tests for releasing the shared tracker resources."""
+
+    def test_close_after_announces(self) -> None:
+        """Test that close() shuts the session and socket used by HTTP and UDP announces."""
+
+        async def run() -> None:
+            runner, url = await _start_fake_http_tracker()
+            server, _, addr = await _start_fake_tracker()
+            try:
+                response = await Tracker(url, b"\x01" * 20, generate_peer_id(), 6881).announce()
+                assert response["peers"] == [{"ip": "10.0.0.1", "port": 6881}]
+                await _udp_tracker(addr).announce()
+                session = Tracker.get_session()
+                endpoint = await Tracker.get_udp_endpoint()
+            finally:
+                await Tracker.close()
+                server.close()
+                await runner.cleanup()
+
+            await asyncio.sleep(0)  # connection_lost runs on the next loop iteration
+            assert session.closed
+            assert endpoint.transport is None
+            assert asyncio.get_running_loop() not in Tracker._http_sessions
+            assert asyncio.get_running_loop() not in Tracker._udp_endpoints
+
+        asyncio.run(run())
+
+
+class TestUDPTrackerEndpoint:
+    """Tests for UDP request matching and retries."""
+
+    def test_lost_request_is_resent(self) -> None:
+        """Test that a request whose packet was dropped is sent again after the timeout."""
+
+        async def run() -> None:
+            server, tracker, addr = await _start_fake_tracker(drop=1)
+            try:
+                endpoint = await Tracker.get_udp_endpoint()
+                reply = await endpoint.request(_connect_request(7), addr, 7, timeouts=(0.05, 5.0))
+                assert struct.unpack(">IIQ", reply) == (0, 7, 1007)
+                assert len(tracker.requests) == 2
+                assert not endpoint.pending
+            finally:
+                server.close()
+                await Tracker.close()
+
+        asyncio.run(run())
+
+    def test_request_times_out(self) -> None:
+        """Test that a request gives up once every send has timed out."""
+
+        async def run() -> None:
+            server, tracker, addr = await _start_fake_tracker(drop=3)
+            try:
+                endpoint = await Tracker.get_udp_endpoint()
+                with pytest.raises(TimeoutError):
+                    await endpoint.request(_connect_request(7), addr, 7, timeouts=(0.02, 0.02))
+                assert len(tracker.requests) == 2
+                assert not endpoint.pending
+            finally:
+                server.close()
+                await Tracker.close()
+
+        asyncio.run(run())
+
+    def test_replies_routed_by_transaction_id(self) -> None:
+        """Test that replies arriving out of order reach the request with the same transaction ID."""
+
+        async def run() -> None:
+            server, _, addr = await _start_fake_tracker(hold=2, junk=True)
+            try:
+                endpoint = await Tracker.get_udp_endpoint()
+                first, second = await asyncio.gather(
+                    endpoint.request(_connect_request(1), addr, 1, timeouts=(5.0,)),
+                    endpoint.request(_connect_request(2), addr, 2, timeouts=(5.0,)),
+                )
+                assert struct.unpack(">IIQ", first) == (0, 1, 1001)
+                assert struct.unpack(">IIQ", second) == (0, 2, 1002)
+            finally:
+                server.close()
+                await Tracker.close()
+
+        asyncio.run(run())
+
+    def test_short_datagram_ignored(self) -> None:
+        """Test that a datagram too short to carry a transaction ID is dropped."""
+
+        async def run() -> None:
+            endpoint = await Tracker.get_udp_endpoint()
+            try:
+                future = asyncio.get_running_loop().create_future()
+                endpoint.pending[0] = future
+                endpoint.datagram_received(b"\x00" * 7, ("127.0.0.1", 1))
+                assert not future.done()
+                del endpoint.pending[0]
+            finally:
+                await Tracker.close()
+
+        asyncio.run(run())
+
+
+class TestUDPConnectionIds:
+    """Tests for reusing UDP tracker connection IDs."""
+
+    def test_connection_id_reused_until_expiry(self) -> None:
+        """Test that announces share a connection ID until it expires."""
+
+        async def run() -> None:
+            server, tracker, addr = await _start_fake_tracker()
+            try:
+                client = _udp_tracker(addr)
+                response = await client.announce()
+                assert response["peers"] == [{"ip": "10.0.0.1", "port": 6881}]
+                await client.announce()
+                assert tracker.connect_count == 1
+
+                endpoint = await Tracker.get_udp_endpoint()
+                connection_id, _ = endpoint.connection_ids[addr]
+                endpoint.connection_ids[addr] = (connection_id, time.monotonic() - 1)
+                assert endpoint.get_connection_id(addr) is None
+                assert addr not in endpoint.connection_ids
+
+                await client.announce()
+                assert tracker.connect_count == 2
+            finally:
+                server.close()
+                await Tracker.close()
+
+        asyncio.run(run())
+
+    def test_connection_id_dropped_after_failed_announce(self) -> None:
+        """Test that a rejected announce forgets the connection ID so the next one reconnects."""
+
+        async def run() -> None:
+            server, tracker, addr = await _start_fake_tracker(fail_announce=True)
+            try:
+                client = _udp_tracker(addr)
+                with pytest.raises(TrackerError, match="action 3"):
+                    await client.announce()
+                endpoint = await Tracker.get_udp_endpoint()
+                assert addr not in endpoint.connection_ids
+
+                tracker.fail_announce = False
+                await client.announce()
+                assert tracker.connect_count == 2
+            finally:
+                server.close()
+                await Tracker.close()
+
+        asyncio.run(run())